@@ -1,21 +1,40 @@
 from __future__ import annotations
 
+import atexit
+import functools
+import itertools
 import json
 import os
+import re
 import shutil
 import signal
+import socket
 import stat
+import struct
 import subprocess
 import sys
+import tempfile
 import threading
 import time
+import uuid
 from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    FIRST_EXCEPTION,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass, field
-from fractions import Fraction
 from pathlib import Path
-from typing import Callable, Iterable, Optional, Tuple
+from typing import Callable, Iterable, Iterator, Optional, Tuple
 
-from progress_tracker import StageProgressTracker, TaskProgressEmitter
+from progress_tracker import ProgressAggregator, StageProgressTracker, TaskProgressEmitter
+
+try:  # orjson 为可选依赖，安装后用于加速 ffprobe JSON 解析
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - depends on environment
+    _json_loads = json.loads
 
 
 class ConverterError(Exception):
@@ -61,6 +80,12 @@ FORMAT_STAGE_LABELS = {
     "png_sequence": "PNG 序列导出",
 }
 
+FORMAT_NAMES = {
+    "gif": "GIF",
+    "apng": "APNG",
+    "png_sequence": "PNG 序列",
+}
+
 FORMAT_LOG_PREFIX = {
     "gif": "正在生成 GIF",
     "apng": "正在生成 APNG",
@@ -77,6 +102,12 @@ class ConversionProgress:
     task_progress: float
     overall_progress: float
 
+    @property
+    def is_boundary(self) -> bool:
+        """Whether this update starts or finishes a task and must not be dropped."""
+
+        return self.task_progress <= 0.0 or self.task_progress >= 1.0
+
 
 ProgressCallback = Callable[[ConversionProgress], None]
 
@@ -95,45 +126,75 @@ class ConversionTask:
     start_number: Optional[int] = None
     total_frames: Optional[int] = None
     duration_ms: Optional[int] = None
+    # 添加时探测到的尺寸与帧率，界面填写默认参数时直接复用，无需再次运行 ffprobe
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
 
 
 @dataclass(slots=True)
 class ControlSignals:
     pause_event: threading.Event = field(default_factory=threading.Event)
     cancel_event: threading.Event = field(default_factory=threading.Event)
-    _process: Optional[subprocess.Popen] = None
+    # 并行转换时同时存在多个 ffmpeg 进程，暂停、恢复与取消需作用于全部进程
+    _processes: list[subprocess.Popen] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
     cancel_reason: str | None = None
 
-    def attach(self, process: Optional[subprocess.Popen]) -> None:
-        self._process = process
-        if process is None:
+    def attach(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.append(process)
+            # 进程启动前已请求暂停时同样需要挂起；与 request_resume 共用锁避免挂起后无人恢复
+            if not self.pause_event.is_set() and sys.platform != "win32":
+                try:
+                    process.send_signal(signal.SIGSTOP)
+                except Exception:
+                    pass
+
+    def detach(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            if process in self._processes:
+                self._processes.remove(process)
+            idle = not self._processes
+        if idle:
             self.pause_event.set()
 
-    def request_pause(self) -> None:
-        self.pause_event.clear()
-        if self._process and sys.platform != "win32":
+    def _signal_processes(self, action: Callable[[subprocess.Popen], None]) -> None:
+        # 调用方需持有 _lock
+        for process in self._processes:
             try:
-                self._process.send_signal(signal.SIGSTOP)
+                action(process)
             except Exception:
                 pass
 
+    def wait_if_paused(self) -> bool:
+        """Block while paused; return ``True`` if the run has been cancelled.
+
+        ``request_cancel`` also sets ``pause_event``, so a single wait covers
+        both resuming and cancelling without polling.
+        """
+
+        self.pause_event.wait()
+        return self.cancel_event.is_set()
+
+    def request_pause(self) -> None:
+        with self._lock:
+            self.pause_event.clear()
+            if sys.platform != "win32":
+                self._signal_processes(lambda process: process.send_signal(signal.SIGSTOP))
+
     def request_resume(self) -> None:
-        self.pause_event.set()
-        if self._process and sys.platform != "win32":
-            try:
-                self._process.send_signal(signal.SIGCONT)
-            except Exception:
-                pass
+        with self._lock:
+            self.pause_event.set()
+            if sys.platform != "win32":
+                self._signal_processes(lambda process: process.send_signal(signal.SIGCONT))
 
     def request_cancel(self, reason: str | None = None) -> None:
         self.cancel_reason = reason or "转换已被终止"
-        self.cancel_event.set()
-        self.pause_event.set()
-        if self._process:
-            try:
-                self._process.terminate()
-            except Exception:
-                pass
+        with self._lock:
+            self.cancel_event.set()
+            self.pause_event.set()
+            self._signal_processes(lambda process: process.terminate())
 
 
 @dataclass(slots=True)
@@ -147,6 +208,9 @@ class ConversionRequest:
     scale_mode: str = DEFAULT_SCALE_MODE
     signals: ControlSignals | None = None
     export_formats: tuple[str, ...] = DEFAULT_EXPORT_FORMATS
+    batch_size: int = 1
+    max_workers: Optional[int] = None
+    hwaccel: bool = True
 
 
 def _resource_root() -> Path:
@@ -159,8 +223,39 @@ def _resource_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
 
+_BINARY_CACHE: dict[str, tuple[Path, int]] = {}
+
+# POSIX 下不逐个关闭继承的文件描述符，使 subprocess 可走 posix_spawn 快速路径
+# （Python 创建的描述符默认不可继承，因此是安全的）；Windows 下不弹出控制台窗口
+if os.name == "posix":
+    _POPEN_KWARGS: dict = {"close_fds": False}
+else:
+    _POPEN_KWARGS = {"creationflags": subprocess.CREATE_NO_WINDOW}
+
+# 转换用的 ffmpeg 以较低调度优先级运行，占满 CPU 时界面仍能及时响应
+_FFMPEG_NICENESS = 5
+_CONVERT_POPEN_KWARGS: dict = (
+    {}
+    if os.name == "posix"
+    else {"creationflags": subprocess.CREATE_NO_WINDOW | subprocess.BELOW_NORMAL_PRIORITY_CLASS}
+)
+
+
 def _get_binary_path(tool_name: str) -> Path:
-    """Locate a bundled ffmpeg-related binary."""
+    """Locate a bundled ffmpeg-related binary.
+
+    A successful lookup is cached together with the binary's mtime, so later
+    calls cost a single ``stat``; a replaced or removed binary is re-checked.
+    """
+
+    cached = _BINARY_CACHE.get(tool_name)
+    if cached is not None:
+        cached_path, cached_mtime = cached
+        try:
+            if cached_path.stat().st_mtime_ns == cached_mtime:
+                return cached_path
+        except OSError:
+            pass
 
     base_path = _resource_root() / "resources" / "ffmpeg"
 
@@ -186,6 +281,7 @@ def _get_binary_path(tool_name: str) -> Path:
         except PermissionError as exc:  # pragma: no cover - depends on FS
             raise ConverterError(f"无法为 {tool_name} 设置可执行权限") from exc
 
+    _BINARY_CACHE[tool_name] = (binary_path, binary_path.stat().st_mtime_ns)
     return binary_path
 
 
@@ -199,11 +295,140 @@ def get_ffprobe_executable() -> Path:
     return _get_binary_path("ffprobe")
 
 
-def probe_video_metadata(
-    video_path: Path,
-) -> Tuple[int, int, float, Optional[int], Optional[int]]:
-    """Return width, height, fps, total frames, duration ms."""
+_PROBE_CACHE_FILE = Path.home() / ".cache" / "convert-videos" / "probe.json"
+_PROBE_CACHE_LIMIT = 2048
+
+_probe_cache_lock = threading.Lock()
+_probe_cache_write_lock = threading.Lock()
+_persistent_probe_cache: dict[str, list] | None = None
+# 内存中的探测缓存是否有尚未写入磁盘的改动
+_probe_cache_dirty = False
+
+
+def _load_probe_cache() -> dict[str, list]:
+    """Load the on-disk probe cache once per process."""
+
+    global _persistent_probe_cache
 
+    if _persistent_probe_cache is None:
+        try:
+            with open(_PROBE_CACHE_FILE, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            _persistent_probe_cache = data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            _persistent_probe_cache = {}
+    return _persistent_probe_cache
+
+
+def _store_probe_result(key: str, stamp: list[int], result: tuple) -> None:
+    global _probe_cache_dirty
+
+    with _probe_cache_lock:
+        cache = _load_probe_cache()
+        # 同一路径只保留最新的一条，文件变化后旧结果直接被覆盖
+        cache.pop(key, None)
+        cache[key] = [*stamp, *result]
+        while len(cache) > _PROBE_CACHE_LIMIT:
+            cache.pop(next(iter(cache)))
+        _probe_cache_dirty = True
+
+
+def flush_probe_cache() -> None:
+    """Write pending probe results to disk; called once per probe batch and at exit."""
+
+    global _probe_cache_dirty
+
+    # 写入串行进行，较旧的快照不会覆盖较新的；每次写入使用唯一的临时文件再原子替换
+    with _probe_cache_write_lock:
+        with _probe_cache_lock:
+            if not _probe_cache_dirty or _persistent_probe_cache is None:
+                return
+            snapshot = json.dumps(_persistent_probe_cache, ensure_ascii=False)
+            _probe_cache_dirty = False
+
+        temp_name: Optional[str] = None
+        try:
+            _PROBE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=_PROBE_CACHE_FILE.parent,
+                prefix=f"{_PROBE_CACHE_FILE.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as file:
+                temp_name = file.name
+                file.write(snapshot)
+            os.replace(temp_name, _PROBE_CACHE_FILE)
+        except OSError:  # pragma: no cover - cache is best effort
+            if temp_name is not None:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
+
+
+atexit.register(flush_probe_cache)
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_probe(kind: str, path_str: str, mtime_ns: int, size: int) -> tuple:
+    key = f"{kind}:{path_str}"
+    stamp = [mtime_ns, size]
+    with _probe_cache_lock:
+        cached = _load_probe_cache().get(key)
+    if cached is not None and cached[:2] == stamp:
+        return tuple(cached[2:])
+
+    if kind == "video":
+        result = _probe_video_metadata(Path(path_str))
+    else:
+        result = _probe_animated_image_metadata(Path(path_str))
+    _store_probe_result(key, stamp, result)
+    return result
+
+
+def _probe_with_cache(kind: str, path: Path) -> tuple:
+    """Return cached ffprobe results keyed by path, mtime and size."""
+
+    try:
+        st = path.stat()
+    except OSError:
+        # 文件不可访问时直接探测，由 ffprobe 给出错误信息
+        if kind == "video":
+            return _probe_video_metadata(path)
+        return _probe_animated_image_metadata(path)
+
+    return _cached_probe(kind, str(path), st.st_mtime_ns, st.st_size)
+
+
+def probe_video_metadata(video_path: Path) -> Tuple[int, int, float, Optional[int], Optional[int]]:
+    """Return width, height, fps, total frames, duration ms.
+
+    When the container does not report a frame count it is estimated from
+    duration and fps; if both are missing the frame count is ``None``.
+    """
+
+    return _probe_with_cache("video", video_path)
+
+
+def _decode_output(raw: bytes) -> str:
+    """Decode ffmpeg/ffprobe output, which is always UTF-8 regardless of locale."""
+
+    return raw.decode("utf-8", errors="replace").strip()
+
+
+def _parse_frame_rate(rate: str) -> float:
+    """Parse an ffprobe rate such as ``30000/1001`` into frames per second."""
+
+    numerator, _, denominator = rate.partition("/")
+    den = float(denominator or "1")
+    if den == 0:
+        raise ZeroDivisionError
+    return float(numerator) / den
+
+
+def _probe_video_metadata(video_path: Path) -> Tuple[int, int, float, Optional[int], Optional[int]]:
     ffprobe_path = get_ffprobe_executable()
 
     command = [
@@ -212,6 +437,8 @@ def probe_video_metadata(
         "error",
         "-select_streams",
         "v:0",
+        "-read_intervals",
+        "%+#1",
         "-show_entries",
         "stream=width,height,r_frame_rate,nb_frames,duration_ts,time_base",
         "-of",
@@ -219,27 +446,18 @@ def probe_video_metadata(
         str(video_path),
     ]
 
-    process = subprocess.run(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
+    process = subprocess.run(command, capture_output=True, **_POPEN_KWARGS)
 
     if process.returncode != 0:
-        message = process.stderr.strip() or "无法读取视频信息"
+        message = _decode_output(process.stderr) or "无法读取视频信息"
         raise ConverterError(message)
 
     try:
-        data = json.loads(process.stdout)
+        data = _json_loads(process.stdout)
         stream = data["streams"][0]
         width = int(stream["width"])
         height = int(stream["height"])
-        rate = stream.get("r_frame_rate", "0/1")
-        fraction = Fraction(rate)
-        if fraction.denominator == 0:
-            raise ZeroDivisionError
-        fps = float(fraction)
+        fps = _parse_frame_rate(stream.get("r_frame_rate", "0/1"))
         nb_frames = stream.get("nb_frames")
         if nb_frames and nb_frames.isdigit():
             total_frames = int(nb_frames)
@@ -261,34 +479,9 @@ def probe_video_metadata(
     ) as exc:
         raise ConverterError("解析视频信息失败") from exc
 
-    if total_frames is None:
-        count_command = [
-            str(ffprobe_path),
-            "-v",
-            "error",
-            "-count_frames",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=nb_read_frames",
-            "-of",
-            "default=nokey=1:noprint_wrappers=1",
-            str(video_path),
-        ]
-        count_process = subprocess.run(
-            count_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        if count_process.returncode == 0:
-            try:
-                total_frames = int(count_process.stdout.strip())
-            except ValueError:
-                total_frames = None
-
+    # 容器未给出帧数时用时长和帧率估算，避免为计数完整解码整段视频
     if total_frames is None and duration_ms is not None:
-        total_frames = max(1, int(fps * duration_ms / 1000))
+        total_frames = max(1, round(fps * duration_ms / 1000))
 
     if width <= 0 or height <= 0 or fps <= 0:
         raise ConverterError("获取到的视频参数无效")
@@ -296,16 +489,109 @@ def probe_video_metadata(
     return width, height, fps, total_frames, duration_ms
 
 
+_JPEG_SOF_MARKERS = frozenset(
+    {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+)
+
+
+def _read_jpeg_size(handle) -> Optional[Tuple[int, int]]:
+    """Walk JPEG markers until a SOFn segment carrying the frame size."""
+
+    handle.seek(2)
+    while True:
+        marker = handle.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:  # 填充字节
+            handle.seek(-1, os.SEEK_CUR)
+            continue
+        if code == 0x01 or 0xD0 <= code <= 0xD7:  # 无长度字段的独立标记
+            continue
+        length_bytes = handle.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if code in _JPEG_SOF_MARKERS:
+            segment = handle.read(5)
+            if len(segment) < 5:
+                return None
+            height, width = struct.unpack(">HH", segment[1:5])
+            return width, height
+        if length < 2:
+            return None
+        handle.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_image_size(image_path: Path) -> Optional[Tuple[int, int]]:
+    """Read width/height from PNG, JPEG, BMP or WebP headers without PIL."""
+
+    with image_path.open("rb") as handle:
+        header = handle.read(32)
+        if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+            return struct.unpack(">II", header[16:24])
+        if header.startswith(b"\xff\xd8"):
+            return _read_jpeg_size(handle)
+        if header[:2] == b"BM" and struct.unpack("<I", header[14:18])[0] >= 40:
+            # BITMAPINFOHEADER 的高度为负数时表示自上而下存储；更老的 OS/2 头交给 PIL
+            width, height = struct.unpack("<ii", header[18:26])
+            return width, abs(height)
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP" and len(header) >= 30:
+            chunk = header[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", header[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L" and header[20] == 0x2F:
+                (bits,) = struct.unpack("<I", header[21:25])
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                width = int.from_bytes(header[24:27], "little") + 1
+                height = int.from_bytes(header[27:30], "little") + 1
+                return width, height
+    return None
+
+
+def is_animated_png(image_path: Path) -> bool:
+    """Return whether a PNG declares animation, i.e. has ``acTL`` before its image data."""
+
+    try:
+        with image_path.open("rb") as handle:
+            if handle.read(8) != b"\x89PNG\r\n\x1a\n":
+                return False
+            # 规范要求 acTL 出现在首个 IDAT 之前，只需遍历图像数据前的块头
+            while True:
+                chunk_header = handle.read(8)
+                if len(chunk_header) < 8:
+                    return False
+                length, chunk_type = struct.unpack(">I4s", chunk_header)
+                if chunk_type == b"acTL":
+                    return True
+                if chunk_type == b"IDAT":
+                    return False
+                handle.seek(length + 4, os.SEEK_CUR)
+    except OSError:
+        return False
+
+
 def probe_image_metadata(
     image_path: Path,
 ) -> Tuple[int, int, Optional[int], Optional[int]]:
-    from PIL import Image
-
+    # 常见格式直接解析文件头，未识别的格式再交给 PIL
     try:
-        with Image.open(image_path) as img:
-            width, height = img.size
-    except Exception as exc:  # noqa: BLE001
-        raise ConverterError(f"解析图片信息失败：{image_path.name}") from exc
+        size = _read_image_size(image_path)
+    except (OSError, struct.error):
+        size = None
+
+    if size is not None:
+        width, height = size
+    else:
+        from PIL import Image
+
+        try:
+            with Image.open(image_path) as img:
+                width, height = img.size
+        except Exception as exc:  # noqa: BLE001
+            raise ConverterError(f"解析图片信息失败：{image_path.name}") from exc
 
     if width <= 0 or height <= 0:
         raise ConverterError("获取到的图片尺寸无效")
@@ -318,6 +604,12 @@ def probe_animated_image_metadata(
 ) -> Tuple[int, int, float, Optional[int], Optional[int]]:
     """Probe GIF/APNG metadata using ffprobe. Returns width, height, fps, total frames, duration ms."""
 
+    return _probe_with_cache("animated", image_path)
+
+
+def _probe_animated_image_metadata(
+    image_path: Path,
+) -> Tuple[int, int, float, Optional[int], Optional[int]]:
     ffprobe_path = get_ffprobe_executable()
 
     command = [
@@ -333,34 +625,27 @@ def probe_animated_image_metadata(
         str(image_path),
     ]
 
-    process = subprocess.run(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
+    process = subprocess.run(command, capture_output=True, **_POPEN_KWARGS)
 
     if process.returncode != 0:
-        message = process.stderr.strip() or f"无法读取 {image_path.suffix} 信息"
+        message = _decode_output(process.stderr) or f"无法读取 {image_path.suffix} 信息"
         raise ConverterError(message)
 
     try:
-        data = json.loads(process.stdout)
+        data = _json_loads(process.stdout)
         stream = data["streams"][0]
         width = int(stream["width"])
         height = int(stream["height"])
 
-        rate = stream.get("r_frame_rate", "10/1")
-        fraction = Fraction(rate)
-        if fraction.denominator == 0:
-            raise ZeroDivisionError
-        fps = float(fraction)
+        fps = _parse_frame_rate(stream.get("r_frame_rate", "10/1"))
 
         nb_frames = stream.get("nb_frames")
-        if nb_frames and str(nb_frames).replace(".", "").isdigit():
-            total_frames = int(float(nb_frames))
-        else:
-            total_frames = None
+        total_frames = None
+        if nb_frames:
+            try:
+                total_frames = int(float(nb_frames))
+            except (ValueError, TypeError, OverflowError):
+                pass
 
         duration = stream.get("duration")
         duration_ms = None
@@ -388,8 +673,131 @@ def probe_animated_image_metadata(
     return width, height, fps, total_frames, duration_ms
 
 
-def _gif_filter(width: int, height: int, fps: float, scale_mode: str = "center_crop") -> str:
-    """Generate FFmpeg filter based on scale mode.
+def _usable_cpus() -> int:
+    """Return the CPUs this process may run on, honouring affinity masks."""
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 2
+
+
+_cleanup_executor: ThreadPoolExecutor | None = None
+_cleanup_lock = threading.Lock()
+# _reset_directory 移到一旁等待删除的旧目录名后缀
+_STALE_DIRECTORY_PATTERN = re.compile(r"\.old-[0-9a-f]{32}$")
+
+
+def _delete_in_background(path: Path) -> None:
+    global _cleanup_executor
+
+    with _cleanup_lock:
+        if _cleanup_executor is None:
+            _cleanup_executor = ThreadPoolExecutor(max_workers=1)
+        _cleanup_executor.submit(shutil.rmtree, path, True)
+
+
+def _reset_directory(path: Path) -> None:
+    """Give ``path`` a fresh empty directory, deleting old contents in the background.
+
+    The old directory is renamed aside first so the encoder can start writing
+    immediately instead of waiting for a potentially large recursive delete.
+    """
+
+    if path.exists():
+        stale = path.with_name(f"{path.name}.old-{uuid.uuid4().hex}")
+        try:
+            os.replace(path, stale)
+        except OSError:
+            # 无法重命名（例如文件被占用）时退回同步删除
+            shutil.rmtree(path)
+        else:
+            _delete_in_background(stale)
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def _sweep_stale_directories(parent: Path) -> None:
+    """Delete directories left aside by ``_reset_directory`` in an earlier, interrupted run."""
+
+    try:
+        with os.scandir(parent) as entries:
+            stale = [
+                Path(entry.path)
+                for entry in entries
+                if _STALE_DIRECTORY_PATTERN.search(entry.name)
+                and entry.is_dir(follow_symlinks=False)
+            ]
+    except OSError:
+        return
+    for path in stale:
+        _delete_in_background(path)
+
+
+def _needs_metadata(task: ConversionTask) -> bool:
+    return not task.is_sequence and task.total_frames is None and task.duration_ms is None
+
+
+def _prefill_task(task: ConversionTask) -> None:
+    """Fill in the frame count and duration of a task that was never probed."""
+
+    try:
+        if task.source_format in {"gif", "apng"}:
+            metadata = probe_animated_image_metadata(task.source)
+        else:
+            metadata = probe_video_metadata(task.source)
+    except ConverterError:
+        return
+    task.total_frames = metadata[3]
+    task.duration_ms = metadata[4]
+
+
+def _iter_prefilled_tasks(
+    tasks: Iterable[ConversionTask],
+    *,
+    lookahead: int = 8,
+) -> Iterator[ConversionTask]:
+    """Yield tasks in order while probing the upcoming ones in the background.
+
+    Probing overlaps with the ffmpeg run of the current task instead of having
+    to finish for the whole job before the first conversion starts.
+    """
+
+    iterator = iter(tasks)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(lookahead, _usable_cpus())))
+    window: deque[tuple[ConversionTask, Optional[Future]]] = deque()
+
+    def submit(task: ConversionTask) -> None:
+        future = executor.submit(_prefill_task, task) if _needs_metadata(task) else None
+        window.append((task, future))
+
+    try:
+        for task in itertools.islice(iterator, lookahead):
+            submit(task)
+        while window:
+            task, future = window.popleft()
+            if future is not None:
+                future.result()
+            upcoming = next(iterator, None)
+            if upcoming is not None:
+                submit(upcoming)
+            yield task
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        flush_probe_cache()
+
+
+def _iter_batches(
+    tasks: Iterator[ConversionTask], size: int
+) -> Iterator[tuple[int, list[ConversionTask]]]:
+    """Group tasks into lists of ``size``, paired with the offset of each batch."""
+
+    start = 0
+    while batch := list(itertools.islice(tasks, size)):
+        yield start, batch
+        start += len(batch)
+
+
+def _scale_filter(width: int, height: int, scale_mode: str = "center_crop") -> str:
+    """Generate FFmpeg scale filter based on scale mode.
 
     scale_mode options:
     - center_crop: 居中裁切适配 (Center and crop to fit)
@@ -400,21 +808,31 @@ def _gif_filter(width: int, height: int, fps: float, scale_mode: str = "center_c
         # 放大到至少一边填满目标尺寸，然后居中裁切
         return (
             f"scale={width}:{height}:force_original_aspect_ratio=increase,"
-            f"crop={width}:{height},fps={fps}"
+            f"crop={width}:{height}"
         )
     elif scale_mode == "stretch":
         # 拉伸到目标尺寸，不保持宽高比
-        return f"scale={width}:{height},fps={fps}"
+        return f"scale={width}:{height}"
     elif scale_mode == "force_aspect":
         # 保持宽高比，缩放到目标尺寸内，可能产生黑边
         return (
             f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
-            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,fps={fps}"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
         )
     else:
         raise InvalidScaleMode(f"不支持的裁切模式：{scale_mode}")
 
 
+def _gif_filter(width: int, height: int, fps: float, scale_mode: str = "center_crop") -> str:
+    """Generate the fps + scale chain that runs once ahead of the output split.
+
+    fps runs first so frames dropped by the rate conversion are never scaled,
+    and every output branch consumes the already scaled frames.
+    """
+
+    return f"fps={fps},{_scale_filter(width, height, scale_mode)}"
+
+
 def _calculate_apng_params(
     width: int, height: int, fps: float, frame_estimate: Optional[int], target_size_mb: float = 2.0
 ) -> tuple[float, Optional[int]]:
@@ -438,65 +856,149 @@ def _calculate_apng_params(
         return fps, None
 
     # 策略 1: 降低帧率 (最多降低到 6 fps,保证基本流畅度)
+    # 体积与帧数成正比，可直接按比例求出刚好满足目标的帧率
     min_fps = 6.0
-    adjusted_fps = fps
-    adjusted_frames = frame_estimate
+    adjusted_fps = min(fps, max(min_fps, fps * target_size_bytes / estimated_size))
+    adjusted_frames = int(frame_estimate * (adjusted_fps / fps))
 
-    while adjusted_fps > min_fps and estimated_size > target_size_bytes:
-        adjusted_fps = max(min_fps, adjusted_fps * 0.8)
-        adjusted_frames = int(frame_estimate * (adjusted_fps / fps))
-        estimated_size = width * height * bytes_per_pixel * adjusted_frames
-
-    if estimated_size <= target_size_bytes:
+    frame_bytes = width * height * bytes_per_pixel
+    if frame_bytes * adjusted_frames <= target_size_bytes:
         return adjusted_fps, None
 
     # 策略 2: 限制最大帧数
-    max_frames = int(target_size_bytes / (width * height * bytes_per_pixel))
+    max_frames = int(target_size_bytes / frame_bytes)
     if max_frames < adjusted_frames:
         adjusted_frames = max(30, max_frames)  # 至少保留 30 帧
 
     return adjusted_fps, adjusted_frames
 
 
-def _gif_quality_filter(base_filter: str, quality: str) -> str:
-    presets = {
-        "low": base_filter,
-        "medium": (
-            f"{base_filter},split[s0][s1];[s0]palettegen=max_colors=256[p];"
-            "[s1][p]paletteuse"
-        ),
-        "balanced": (
-            f"{base_filter},split[s0][s1];[s0]palettegen="
-            "max_colors=192:stats_mode=single[p];[s1][p]paletteuse="
-            "dither=bayer:bayer_scale=3"
-        ),
-        "high": (
-            f"{base_filter},split[s0][s1];[s0]palettegen="
-            "max_colors=256:stats_mode=single:reserve_transparent=0[p];"
-            "[s1][p]paletteuse=dither=bayer:bayer_scale=2"
-        ),
-        "ultra": (
-            f"{base_filter},split[s0][s1];[s0]palettegen="
-            "max_colors=256:stats_mode=full:reserve_transparent=0[p];"
-            "[s1][p]paletteuse=dither=sierra2_4a"
-        ),
-    }
+# 中间标签带上输入序号，多个输入合并到同一滤镜图时各自独立、互不复用
+_PALETTE_PRESETS: dict[str, Optional[str]] = {
+    "low": None,
+    "medium": (
+        "split[s0_{slot}][s1_{slot}];[s0_{slot}]palettegen=max_colors=256[p_{slot}];"
+        "[s1_{slot}][p_{slot}]paletteuse"
+    ),
+    "balanced": (
+        "split[s0_{slot}][s1_{slot}];[s0_{slot}]palettegen=max_colors=192:stats_mode=single[p_{slot}];"
+        "[s1_{slot}][p_{slot}]paletteuse=dither=bayer:bayer_scale=3"
+    ),
+    "high": (
+        "split[s0_{slot}][s1_{slot}];[s0_{slot}]palettegen="
+        "max_colors=256:stats_mode=single:reserve_transparent=0[p_{slot}];"
+        "[s1_{slot}][p_{slot}]paletteuse=dither=bayer:bayer_scale=2"
+    ),
+    "ultra": (
+        "split[s0_{slot}][s1_{slot}];[s0_{slot}]palettegen="
+        "max_colors=256:stats_mode=full:reserve_transparent=0[p_{slot}];"
+        "[s1_{slot}][p_{slot}]paletteuse=dither=sierra2_4a"
+    ),
+}
+
+
+def _palette_filter(quality: str) -> Optional[str]:
+    """Return the palettegen/paletteuse template for a GIF quality preset.
+
+    The template's intermediate labels carry a ``{slot}`` field to be filled
+    with the input index.
+    """
 
     try:
-        return presets[quality]
+        return _PALETTE_PRESETS[quality]
     except KeyError as exc:  # pragma: no cover - guarded elsewhere
         raise ConverterError("质量参数必须是 low, medium, high 或 ultra") from exc
 
 
-def _run_command(command: list[str]) -> Tuple[int, str]:
-    process = subprocess.run(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
+def _fused_filter_complex(
+    shared_filter: str,
+    branches: list[tuple[str, str]],
+    *,
+    input_index: int = 0,
+) -> str:
+    """Build a filter graph that decodes and scales one input once.
+
+    ``branches`` holds ``(filter chain, output label)`` pairs; the shared
+    stream is fanned out with ``split`` so every output reuses the same frames.
+    An empty chain maps the shared stream straight to the output label.
+    """
+
+    source = f"[{input_index}:v]"
+    if len(branches) == 1:
+        chain, label = branches[0]
+        if chain:
+            return f"{source}{shared_filter},{chain}[{label}]"
+        return f"{source}{shared_filter}[{label}]"
+
+    pads = "".join(f"[in_{label}]" if chain else f"[{label}]" for chain, label in branches)
+    parts = [f"{source}{shared_filter},split={len(branches)}{pads}"]
+    parts.extend(f"[in_{label}]{chain}[{label}]" for chain, label in branches if chain)
+    return ";".join(parts)
+
+
+# 与 Linux 默认管道容量一致，更大的用户态缓冲并不能减少读取次数
+_PIPE_BUFFER_SIZE = 65536
+
+# ffmpeg -progress 输出中进度计算用到的键，其余键直接跳过
+_PROGRESS_KEYS = {
+    b"frame": "frame",
+    b"out_time_us": "out_time_us",
+    b"out_time_ms": "out_time_ms",
+    b"out_time": "out_time",
+    b"progress": "progress",
+}
+# 出错时只需要 stderr 末尾的信息，限制保留的行数避免长时间运行时无限增长
+_STDERR_TAIL_LINES = 64
+# GIF/APNG 源没有可供硬件加速的解码器
+_SOFTWARE_DECODED_FORMATS = frozenset({"gif", "apng"})
+# 滤镜图线程数的上下限：palettegen/paletteuse 受滤镜图约束，过多线程只会增加同步开销
+_MIN_FILTER_THREADS = 2
+_MAX_FILTER_THREADS = 4
+_PROGRESS_BLOCK_PRIORITY = (b"out_time_us", b"out_time_ms", b"out_time", b"frame")
+_PROGRESS_LINE_PATTERN = re.compile(
+    rb"^(frame|out_time_us|out_time_ms|out_time|progress)=([^\r\n]*)",
+    re.MULTILINE,
+)
+
+
+def _drain_pipe(pipe, sink: deque[bytes]) -> None:
+    """Read a pipe to EOF so the child never blocks on a full buffer.
+
+    Only the last ``sink.maxlen`` lines are kept; error details are at the end.
+    """
+
+    sink.extend(pipe)
 
-    return process.returncode, process.stderr.strip()
+
+def _apply_progress_block(
+    tracker: StageProgressTracker,
+    block: dict[bytes, bytes],
+    status: bytes,
+    *,
+    frame_estimate: Optional[int],
+    duration_ms: Optional[int],
+) -> None:
+    """Feed one ``-progress`` block to the tracker as a single update."""
+
+    if status == b"end":
+        tracker.try_update_from_ffmpeg(
+            key="progress",
+            value_text="end",
+            frame_estimate=frame_estimate,
+            duration_ms=duration_ms,
+        )
+        return
+
+    # 按优先级取第一个可用的键，N/A 等无效值自动回退到下一个
+    for key in _PROGRESS_BLOCK_PRIORITY:
+        value = block.get(key)
+        if value is not None and tracker.try_update_from_ffmpeg(
+            key=_PROGRESS_KEYS[key],
+            value_text=value.decode("ascii", "ignore"),
+            frame_estimate=frame_estimate,
+            duration_ms=duration_ms,
+        ):
+            return
 
 
 def _run_ffmpeg_with_progress(
@@ -510,17 +1012,64 @@ def _run_ffmpeg_with_progress(
     duration_ms: Optional[int],
     signals: ControlSignals | None = None,
 ) -> tuple[int, str]:
-    process = subprocess.Popen(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=1,
-    )
+    # POSIX 下进度通过独立的 socketpair 传递，与 stdout 解耦且缓冲区更大；
+    # Windows 不支持 pass_fds，仍使用 stdout 管道
+    progress_sock: socket.socket | None = None
+    child_sock: socket.socket | None = None
+    if os.name == "posix":
+        progress_sock, child_sock = socket.socketpair()
+        progress_target = f"pipe:{child_sock.fileno()}"
+    else:
+        progress_target = "pipe:1"
+
+    command = [command[0], "-progress", progress_target, "-nostats", *command[1:]]
+    try:
+        if child_sock is not None:
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                bufsize=_PIPE_BUFFER_SIZE,
+                pass_fds=(child_sock.fileno(),),
+            )
+        else:
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=_PIPE_BUFFER_SIZE,
+                **_CONVERT_POPEN_KWARGS,
+            )
+    except BaseException:
+        if progress_sock is not None:
+            progress_sock.close()
+        raise
+    finally:
+        # 子进程已持有写端，父进程关闭自己的副本才能在 ffmpeg 退出时读到 EOF
+        if child_sock is not None:
+            child_sock.close()
+
+    if os.name == "posix":
+        try:
+            # 紧随启动调整，ffmpeg 随后创建的编解码线程会继承该优先级
+            os.setpriority(os.PRIO_PROCESS, process.pid, _FFMPEG_NICENESS)
+        except OSError:
+            pass
 
     if signals:
         signals.attach(process)
 
+    # stderr 在后台线程中持续读取，避免管道写满导致 ffmpeg 阻塞
+    stderr_tail: deque[bytes] = deque(maxlen=_STDERR_TAIL_LINES)
+    stderr_thread: threading.Thread | None = None
+    if process.stderr:
+        stderr_thread = threading.Thread(
+            target=_drain_pipe,
+            args=(process.stderr, stderr_tail),
+            daemon=True,
+        )
+        stderr_thread.start()
+
     tracker = StageProgressTracker(
         stage_label=stage_label,
         base=base,
@@ -532,53 +1081,60 @@ def _run_ffmpeg_with_progress(
     try:
         tracker.emit_initial()
 
-        if process.stdout:
-            for raw_line in process.stdout:
-                if signals and signals.cancel_event.is_set():
-                    cancelled = True
-                    process.terminate()
+        if progress_sock is not None:
+            read_chunk = progress_sock.recv
+        elif process.stdout:
+            read_chunk = process.stdout.read1
+        else:
+            read_chunk = None
+
+        if read_chunk is not None:
+            pending = b""
+            block: dict[bytes, bytes] = {}
+            while True:
+                chunk = read_chunk(_PIPE_BUFFER_SIZE)
+                if not chunk:
                     break
-                while (
-                    signals
-                    and not signals.pause_event.is_set()
-                    and not signals.cancel_event.is_set()
-                ):
-                    time.sleep(0.05)
-                if signals and signals.cancel_event.is_set():
+                # 暂停时阻塞等待；取消同样会置位 pause_event 以唤醒
+                if signals and signals.wait_if_paused():
                     cancelled = True
                     process.terminate()
                     break
 
                 now = time.monotonic()
+                tracker.flush_pending(now)
                 if tracker.needs_synthetic_update(now):
                     tracker.synthetic_step(
                         duration_ms=duration_ms,
                         frame_estimate=frame_estimate,
                     )
 
-                line = raw_line.strip()
-                if "=" not in line:
-                    continue
-                key, _, value_text = line.partition("=")
-
-                tracker.try_update_from_ffmpeg(
-                    key=key,
-                    value_text=value_text,
-                    frame_estimate=frame_estimate,
-                    duration_ms=duration_ms,
-                )
+                # 只解析完整的行，末尾不完整的部分留到下一块
+                data = pending + chunk
+                end = data.rfind(b"\n") + 1
+                pending = data[end:]
+                for match in _PROGRESS_LINE_PATTERN.finditer(data, 0, end):
+                    key = match.group(1)
+                    if key != b"progress":
+                        block[key] = match.group(2)
+                        continue
+                    # 每个进度块以 progress= 结尾，整块只更新一次进度
+                    _apply_progress_block(
+                        tracker,
+                        block,
+                        match.group(2),
+                        frame_estimate=frame_estimate,
+                        duration_ms=duration_ms,
+                    )
+                    block.clear()
     finally:
+        if progress_sock is not None:
+            progress_sock.close()
         if process.stdout:
             process.stdout.close()
 
-    if process.stderr:
-        stderr_output = process.stderr.read()
-        process.stderr.close()
-    else:
-        stderr_output = ""
-
     if signals:
-        signals.attach(None)
+        signals.detach(process)
 
     if cancelled:
         try:
@@ -586,13 +1142,120 @@ def _run_ffmpeg_with_progress(
         except subprocess.TimeoutExpired:
             process.kill()
             process.wait()
+        if stderr_thread:
+            stderr_thread.join()
         raise ConversionCancelled
 
     returncode = process.wait()
+    if stderr_thread:
+        stderr_thread.join()
+    if process.stderr:
+        process.stderr.close()
+    # 成功时不需要 stderr 内容，只在出错时解码
+    stderr_output = _decode_output(b"".join(stderr_tail)) if returncode != 0 else ""
     tracker.finish()
     return returncode, stderr_output
 
 
+def _raise_first_failure(futures: Iterable[Future]) -> None:
+    """Re-raise the first failed future, preferring real errors over cancellation."""
+
+    cancelled: Optional[BaseException] = None
+    for future in futures:
+        if not future.done() or future.cancelled():
+            continue
+        exc = future.exception()
+        if exc is None:
+            continue
+        if isinstance(exc, ConversionCancelled):
+            cancelled = cancelled or exc
+            continue
+        raise exc
+    if cancelled is not None:
+        raise cancelled
+
+
+_SETTINGS_STAMP_NAME = ".convert-settings.json"
+
+
+def _read_settings_stamp(path: Path) -> Optional[dict]:
+    try:
+        return _json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_settings_stamp(path: Path, stamp: dict) -> None:
+    try:
+        path.write_text(json.dumps(stamp), encoding="utf-8")
+    except OSError:  # pragma: no cover - stamp is best effort
+        pass
+
+
+def _source_fingerprint(task: ConversionTask) -> Optional[list]:
+    """Return the resolved path, size and mtime identifying a task's source.
+
+    For sequences the size and mtime are the total size and newest mtime of
+    the frames sharing the first frame's extension.
+    """
+
+    try:
+        if task.is_sequence and task.first_frame:
+            extension = (task.frame_extension or task.first_frame.suffix).lower()
+            total_size = 0
+            newest_mtime = 0
+            with os.scandir(task.first_frame.parent) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(extension):
+                        entry_stat = entry.stat()
+                        total_size += entry_stat.st_size
+                        newest_mtime = max(newest_mtime, entry_stat.st_mtime_ns)
+            source = Path(task.sequence_pattern or task.first_frame).resolve()
+            return [str(source), total_size, newest_mtime]
+        source = task.source.resolve()
+        source_stat = source.stat()
+        return [str(source), source_stat.st_size, source_stat.st_mtime_ns]
+    except OSError:
+        return None
+
+
+def _dispatch_batches(
+    batches: Iterable[tuple[int, list[ConversionTask]]],
+    run_batch: Callable[[int, list[ConversionTask]], None],
+    max_workers: int,
+    signals: ControlSignals | None,
+) -> None:
+    """Run batches inline, or on a worker pool that stops at the first failure."""
+
+    if max_workers == 1:
+        for batch_start, batch in batches:
+            run_batch(batch_start, batch)
+        return
+
+    # 动态分派：有空闲 worker 时才提交下一个任务，慢任务不会拖住其他任务
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures: list[Future] = []
+    try:
+        for batch_start, batch in batches:
+            running = [future for future in futures if not future.done()]
+            if len(running) >= max_workers:
+                wait(running, return_when=FIRST_COMPLETED)
+            _raise_first_failure(futures)
+            futures = [future for future in futures if not future.done()]
+            futures.append(executor.submit(run_batch, batch_start, batch))
+        wait(futures, return_when=FIRST_EXCEPTION)
+        _raise_first_failure(futures)
+    except BaseException:
+        # 任一任务失败时终止其余正在运行的 ffmpeg，并优先抛出真正的失败原因
+        if signals and not signals.cancel_event.is_set():
+            signals.request_cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+        _raise_first_failure(futures)
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def convert_files(
     request: ConversionRequest,
     progress: ProgressCallback | None = None,
@@ -610,7 +1273,8 @@ def convert_files(
         target_output_dir.mkdir(parents=True, exist_ok=True)
 
     tasks = list(request.tasks)
-    if not tasks:
+    total_tasks = len(tasks)
+    if not total_tasks:
         raise ConverterError("未选择任何待转换任务")
 
     raw_formats = request.export_formats or DEFAULT_EXPORT_FORMATS
@@ -630,6 +1294,9 @@ def convert_files(
         fmt_dir = target_output_dir / subdir
         fmt_dir.mkdir(parents=True, exist_ok=True)
         format_dirs[fmt] = fmt_dir
+    if "png_sequence" in format_dirs:
+        # 上次运行被强制结束时，后台尚未删完的旧序列目录会留在输出文件夹中
+        _sweep_stale_directories(format_dirs["png_sequence"])
 
     def display_path(path: Path) -> str:
         try:
@@ -643,31 +1310,109 @@ def convert_files(
             f"不支持的裁切模式：{scale_mode}，有效选项为：{', '.join(sorted(VALID_SCALE_MODES))}"
         )
 
-    base_filter = _gif_filter(request.width, request.height, request.fps, scale_mode)
-    palette_filter = _gif_quality_filter(base_filter, request.quality)
+    # 帧率转换与缩放只在共享链路上执行一次
+    shared_filter = _gif_filter(request.width, request.height, request.fps, scale_mode)
+    palette_filter = _palette_filter(request.quality)
+    # 单独的 scale 让 GIF 分支自行协商像素格式，避免 split 把其他输出也降为 GIF 的格式；
+    # 低质量下沿用有序抖动，与直接从 YUV 转换时的效果保持一致
+    gif_chain = f"scale,{palette_filter}" if palette_filter else "scale=sws_dither=bayer"
+    # 多个任务并行转换，各自的 ffmpeg 平分可用 CPU 核心（容器内遵循亲和性限制）
+    usable_cpus = _usable_cpus()
+    max_workers = max(1, request.max_workers or usable_cpus // 2)
+    thread_count = str(max(1, usable_cpus // max_workers))
+    thread_args = ["-threads", thread_count]
+    # 全部滤镜都在 -filter_complex 中，-filter_threads 对其无效，只需调整 -filter_complex_threads
+    filter_thread_count = str(
+        max(_MIN_FILTER_THREADS, min(_MAX_FILTER_THREADS, int(thread_count)))
+    )
+    # 低质量优先速度：PNG 序列的压缩是主要耗时，级别 1 比级别 9 快得多而体积相差不大
+    png_compression = "1" if request.quality == "low" else "9"
 
     signals = request.signals
+    if signals is None and max_workers > 1:
+        # 并行时需要信号对象在某个任务失败后终止其余 ffmpeg
+        signals = ControlSignals()
     if signals:
         signals.pause_event.set()
-    total_tasks = len(tasks)
+    aggregator = ProgressAggregator(total_tasks)
+    # 各批次通用的参数只构建一次
+    command_prefix = (
+        str(ffmpeg_path),
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-filter_complex_threads",
+        filter_thread_count,
+    )
 
     prep_base = 0.05
     formats_extent = 0.90
     format_count = len(export_formats)
-    format_extent = formats_extent / format_count if format_count else 0.0
+    if format_count == 1:
+        stage_label = FORMAT_STAGE_LABELS[export_formats[0]]
+    else:
+        stage_label = "+".join(FORMAT_NAMES[fmt] for fmt in export_formats) + " 转换"
+
+    # 多个任务可合并到同一个 ffmpeg 进程中，分摊短片段的进程启动开销
+    batch_size = max(1, request.batch_size)
+
+    # 每个输出按 (格式, 输出名) 记录生成它的参数与源文件指纹，完全一致且输出仍在时可直接复用；
+    # 开始前先移除记录，本次运行未完成时下次不会误用不完整的输出
+    settings = {
+        "width": request.width,
+        "height": request.height,
+        "fps": request.fps,
+        "quality": request.quality,
+        "scale_mode": scale_mode,
+        "hwaccel": request.hwaccel,
+    }
+    stamp_path = target_output_dir / _SETTINGS_STAMP_NAME
+    previous_stamp = _read_settings_stamp(stamp_path)
+    previous_outputs: dict[str, dict] = {}
+    if isinstance(previous_stamp, dict) and isinstance(previous_stamp.get("outputs"), dict):
+        previous_outputs = previous_stamp["outputs"]
+    try:
+        stamp_path.unlink(missing_ok=True)
+    except OSError:  # pragma: no cover - stamp is best effort
+        previous_outputs = {}
+    # 参数变化时合并而不是替换：未参与本次运行的旧记录原样保留，其输出没有被改动
+    finished_outputs: dict[str, dict] = dict(previous_outputs)
+
+    def output_key(fmt: str, task: ConversionTask) -> str:
+        return f"{fmt}/{task.output_stem}"
+
+    def expected_output(fmt: str, task: ConversionTask) -> Path:
+        if fmt == "png_sequence":
+            return format_dirs[fmt] / task.output_stem
+        return format_dirs[fmt] / f"{task.output_stem}{FORMAT_EXTENSIONS[fmt]}"
+
+    def output_up_to_date(task: ConversionTask, fingerprint: Optional[list]) -> bool:
+        if fingerprint is None:
+            return False
+        expected = {"settings": settings, "source": fingerprint}
+        return all(
+            previous_outputs.get(output_key(fmt, task)) == expected
+            and expected_output(fmt, task).exists()
+            for fmt in export_formats
+        )
 
-    for index, task in enumerate(tasks, start=1):
+    def run_batch(batch_start: int, batch: list[ConversionTask]) -> None:
         if signals and signals.cancel_event.is_set():
             raise ConversionCancelled
 
+        batch_name = "、".join(task.display_name for task in batch)
+
         task_emitter = TaskProgressEmitter(
-            task_index=index,
+            task_index=batch_start + 1,
             total_tasks=total_tasks,
-            task_name=task.display_name,
+            task_name=batch_name,
             progress_callback=progress,
             progress_factory=ConversionProgress,
             signals=signals,
             cancel_exception=ConversionCancelled,
+            task_count=len(batch),
+            aggregator=aggregator,
         )
 
         def emit_abs(progress_value: float, stage: str) -> None:
@@ -675,73 +1420,93 @@ def convert_files(
 
         emit_abs(0.0, "准备")
 
-        input_args: list[str] = []
-        if task.is_sequence and task.sequence_pattern:
-            input_args.extend(
-                [
-                    "-start_number",
-                    str(task.start_number or 0),
-                    "-i",
-                    task.sequence_pattern,
-                ]
-            )
-            total_frames = task.frame_count
-            duration_ms = task.duration_ms
-        else:
-            input_args.extend(["-i", str(task.source)])
-            total_frames = task.total_frames
-            duration_ms = task.duration_ms
-
-        frame_estimate: Optional[int] = None
-        if total_frames and total_frames > 0:
-            frame_estimate = max(1, total_frames)
-        elif duration_ms and duration_ms > 0:
-            frame_estimate = max(1, int(request.fps * (duration_ms / 1000)))
-
         if format_count == 0:
             emit_abs(1.0, "完成")
-            continue
+            return
 
-        for fmt_index, fmt in enumerate(export_formats):
-            stage_base = prep_base + format_extent * fmt_index
-            stage_label = FORMAT_STAGE_LABELS[fmt]
-            log_prefix = FORMAT_LOG_PREFIX[fmt]
-            fmt_dir = format_dirs[fmt]
+        fingerprints = [_source_fingerprint(task) for task in batch]
+        if all(
+            output_up_to_date(task, fingerprint)
+            for task, fingerprint in zip(batch, fingerprints)
+        ):
+            if log:
+                log(f"输出已是最新，跳过：{batch_name}")
+            emit_abs(1.0, "已存在")
+            return
+        # 输出即将被重写，旧记录在本次成功完成前不再有效
+        for task in batch:
+            for fmt in export_formats:
+                finished_outputs.pop(output_key(fmt, task), None)
+
+        # 每个任务内部的所有导出格式共享一次解码与缩放，通过 split 分发到各个输出
+        input_args: list[str] = []
+        graphs: list[str] = []
+        output_args: list[str] = []
+        gif_output_args: list[str] = []
+        log_lines: list[str] = []
+        frame_estimates: list[Optional[int]] = []
+        durations: list[Optional[int]] = []
+
+        for slot, task in enumerate(batch):
+            if task.is_sequence and task.sequence_pattern:
+                input_args.extend(
+                    [
+                        "-start_number",
+                        str(task.start_number or 0),
+                        "-i",
+                        task.sequence_pattern,
+                    ]
+                )
+                total_frames = task.frame_count
+                duration_ms = task.duration_ms
+            else:
+                if request.hwaccel and task.source_format not in _SOFTWARE_DECODED_FORMATS:
+                    # 让 ffmpeg 自动选用平台硬件解码，不可用时会回退到软件解码；
+                    # 解码后的帧仍会下载到内存，后续软件滤镜链无需改动
+                    input_args.extend(["-hwaccel", "auto"])
+                input_args.extend(["-i", str(task.source)])
+                total_frames = task.total_frames
+                duration_ms = task.duration_ms
+
+            frame_estimate: Optional[int] = None
+            if total_frames and total_frames > 0:
+                frame_estimate = max(1, total_frames)
+            elif duration_ms and duration_ms > 0:
+                frame_estimate = max(1, int(request.fps * (duration_ms / 1000)))
+            frame_estimates.append(frame_estimate)
+            durations.append(duration_ms)
+
+            branches: list[tuple[str, str]] = []
+            for fmt in export_formats:
+                fmt_dir = format_dirs[fmt]
 
-            if fmt in {"gif", "apng"}:
-                suffix = FORMAT_EXTENSIONS[fmt]
-                output_path = fmt_dir / f"{task.output_stem}{suffix}"
+                if fmt == "gif":
+                    output_path = fmt_dir / f"{task.output_stem}{FORMAT_EXTENSIONS[fmt]}"
+                    label = f"gif{slot}"
+                    branches.append((gif_chain.format(slot=slot), label))
+                    gif_output_args.extend(["-map", f"[{label}]", *thread_args, str(output_path)])
+                    log_target = output_path
+                elif fmt == "apng":
+                    output_path = fmt_dir / f"{task.output_stem}{FORMAT_EXTENSIONS[fmt]}"
+                    label = f"apng{slot}"
 
-                # 为 APNG 计算优化后的参数
-                if fmt == "apng":
+                    # 为 APNG 计算优化后的参数
                     apng_fps, max_frames = _calculate_apng_params(
                         request.width, request.height, request.fps, frame_estimate
                     )
-                    apng_filter = _gif_filter(request.width, request.height, apng_fps)
-
-                    command: list[str] = [
-                        str(ffmpeg_path),
-                        "-hide_banner",
-                        "-loglevel",
-                        "error",
-                        "-y",
-                        *input_args,
-                    ]
+                    branches.append((f"fps={apng_fps}" if apng_fps != request.fps else "", label))
+                    output_args.extend(["-map", f"[{label}]"])
 
                     # 如果需要限制帧数,添加帧数限制
                     if max_frames:
-                        command.extend(["-frames:v", str(max_frames)])
+                        output_args.extend(["-frames:v", str(max_frames)])
 
-                    command.extend([
-                        "-vf",
-                        apng_filter,
+                    output_args.extend([
+                        *thread_args,
                         "-f", "apng",
                         "-plays", "0",  # 无限循环
-                        "-compression_level", "9",  # 最高压缩级别
+                        "-compression_level", "9",  # 最高压缩级别，APNG 有 2MB 体积限制
                         "-pred", "mixed",  # PNG 预测模式,有助于压缩
-                        "-progress",
-                        "pipe:1",
-                        "-nostats",
                         str(output_path),
                     ])
 
@@ -754,72 +1519,102 @@ def convert_files(
                             adjustments.append(f"最大帧数: {max_frames}")
                         if log:
                             log(f"⚠️ 为控制文件大小在 2MB 以内,已自动调整 APNG 参数: {', '.join(adjustments)}")
-                else:
-                    # GIF 导出保持原样
-                    command: list[str] = [
-                        str(ffmpeg_path),
-                        "-hide_banner",
-                        "-loglevel",
-                        "error",
-                        "-y",
-                        *input_args,
-                        "-vf",
-                        palette_filter,
-                        "-progress",
-                        "pipe:1",
-                        "-nostats",
-                        str(output_path),
-                    ]
 
-                log_target = output_path
-            elif fmt == "png_sequence":
-                sequence_root = fmt_dir / task.output_stem
-                if sequence_root.exists():
-                    shutil.rmtree(sequence_root)
-                sequence_root.mkdir(parents=True, exist_ok=True)
-                pattern_path = sequence_root / f"{task.output_stem}_%04d.png"
-
-                command = [
-                    str(ffmpeg_path),
-                    "-hide_banner",
-                    "-loglevel",
-                    "error",
-                    "-y",
-                    *input_args,
-                    "-vf",
-                    base_filter,
-                    "-progress",
-                    "pipe:1",
-                    "-nostats",
-                    str(pattern_path),
-                ]
-
-                log_target = sequence_root
-            else:  # pragma: no cover - guarded by validation
-                raise InvalidExportFormat(f"不支持的导出格式：{fmt}")
+                    log_target = output_path
+                elif fmt == "png_sequence":
+                    sequence_root = fmt_dir / task.output_stem
+                    _reset_directory(sequence_root)
+                    pattern_path = sequence_root / f"{task.output_stem}_%04d.png"
+                    label = f"png{slot}"
+
+                    branches.append(("", label))
+                    output_args.extend([
+                        "-map", f"[{label}]",
+                        *thread_args,
+                        "-compression_level", png_compression,
+                        "-pred", "mixed",
+                        str(pattern_path),
+                    ])
 
-            if log:
-                log(f"{log_prefix}：{display_path(log_target)}")
+                    log_target = sequence_root
+                else:  # pragma: no cover - guarded by validation
+                    raise InvalidExportFormat(f"不支持的导出格式：{fmt}")
 
-            return_code, stderr_output = _run_ffmpeg_with_progress(
-                command,
-                emit=emit_abs,
-                stage_label=stage_label,
-                base=stage_base,
-                extent=format_extent,
-                frame_estimate=frame_estimate,
-                duration_ms=duration_ms,
-                signals=signals,
-            )
+                log_lines.append(f"{FORMAT_LOG_PREFIX[fmt]}：{display_path(log_target)}")
 
-            if return_code != 0:
-                detail = stderr_output or "未知错误"
-                if fmt == "gif":
-                    message = f"转换 GIF 失败（{task.display_name}）：{detail}"
-                elif fmt == "apng":
-                    message = f"转换 APNG 失败（{task.display_name}）：{detail}"
-                else:
-                    message = f"导出 PNG 序列失败（{task.display_name}）：{detail}"
-                raise ConverterError(message)
+            graphs.append(_fused_filter_complex(shared_filter, branches, input_index=slot))
 
+        if len(batch) == 1:
+            batch_frames = frame_estimates[0]
+            batch_duration = durations[0]
+        else:
+            # 多个输入并行处理时 frame 只反映第一个输出，改用最长输出的时间戳估算进度
+            batch_frames = None
+            batch_duration = max((value for value in durations if value), default=None)
+
+        command: list[str] = [
+            *command_prefix,
+            *input_args,
+            "-filter_complex",
+            ";".join(graphs),
+            *output_args,
+            # 调色板 GIF 需等待整段输入才开始输出，放在最后使 -progress 跟踪持续输出的文件
+            *gif_output_args,
+        ]
+
+        if log:
+            for line in log_lines:
+                log(line)
+
+        return_code, stderr_output = _run_ffmpeg_with_progress(
+            command,
+            emit=emit_abs,
+            stage_label=stage_label,
+            base=prep_base,
+            extent=formats_extent,
+            frame_estimate=batch_frames,
+            duration_ms=batch_duration,
+            signals=signals,
+        )
+
+        if return_code != 0:
+            if len(batch) > 1:
+                # 合并运行时任一输入无法读取都会让整个进程失败，逐个重试，
+                # 其余任务照常产出，报错也只指向真正失败的输入
+                if log:
+                    log(f"⚠️ 合并转换失败，改为逐个转换：{batch_name}")
+                failure: Optional[ConverterError] = None
+                for offset, task in enumerate(batch):
+                    try:
+                        run_batch(batch_start + offset, [task])
+                    except ConverterError as exc:
+                        failure = failure or exc
+                if failure is not None:
+                    raise failure
+                return
+
+            detail = stderr_output or "未知错误"
+            if format_count > 1:
+                message = f"{stage_label}失败（{batch_name}）：{detail}"
+            elif export_formats[0] == "gif":
+                message = f"转换 GIF 失败（{batch_name}）：{detail}"
+            elif export_formats[0] == "apng":
+                message = f"转换 APNG 失败（{batch_name}）：{detail}"
+            else:
+                message = f"导出 PNG 序列失败（{batch_name}）：{detail}"
+            raise ConverterError(message)
+
+        for task, fingerprint in zip(batch, fingerprints):
+            if fingerprint is not None:
+                for fmt in export_formats:
+                    finished_outputs[output_key(fmt, task)] = {
+                        "settings": settings,
+                        "source": fingerprint,
+                    }
         emit_abs(1.0, "完成")
+
+    # 后续任务的元数据探测与当前 ffmpeg 并行进行
+    batches = _iter_batches(_iter_prefilled_tasks(tasks), batch_size)
+    _dispatch_batches(batches, run_batch, max_workers, signals)
+    # 全部任务完成后才记录本次设置，中途失败或取消的输出不会在下次被当作可复用
+    _write_settings_stamp(stamp_path, {"outputs": finished_outputs})
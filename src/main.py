@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import functools
 import io
+import itertools
+import os
+import posixpath
 import re
 import sys
+import threading
 import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from contextlib import redirect_stdout
 from pathlib import Path
-from typing import Iterable, List, NamedTuple, Optional
+from typing import Iterable, Iterator, NamedTuple, Optional
+from xml.etree import ElementTree
 
-from PySide6.QtCore import Qt, QMimeData, QThread, QRegularExpression, Signal
+from PySide6.QtCore import Qt, QEvent, QMimeData, QThread, QRegularExpression, QTimer, Signal
 from PySide6.QtGui import (
     QColor,
     QDragEnterEvent,
@@ -31,6 +40,7 @@ from PySide6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QMessageBox,
+    QPlainTextEdit,
     QProgressBar,
     QPushButton,
     QTabWidget,
@@ -41,17 +51,19 @@ from PySide6.QtWidgets import (
 
 from converter import (
     DEFAULT_EXPORT_FORMATS,
+    ConversionCancelled,
     ConversionProgress,
     ConversionRequest,
     ConversionTask,
     ConverterError,
     ControlSignals,
     convert_files,
+    flush_probe_cache,
+    is_animated_png,
     probe_animated_image_metadata,
     probe_image_metadata,
     probe_video_metadata,
 )
-from openpyxl import load_workbook
 
 from process_excel import (
     DEFAULT_TEMPLATE,
@@ -73,11 +85,50 @@ SCALE_MODE_OPTIONS = [
     ("强制保持原始宽高比", "force_aspect"),
 ]
 
-VIDEO_EXTENSIONS = {".mp4", ".mov", ".m4v", ".mpg", ".mpeg"}
-IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"}
-ANIMATED_EXTENSIONS = {".gif"}  # GIF 和 APNG(.png) 动画格式
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mov", ".m4v", ".mpg", ".mpeg"})
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"})
+ANIMATED_EXTENSIONS = frozenset({".gif"})  # GIF 和 APNG(.png) 动画格式
 SUPPORTED_EXTENSIONS = VIDEO_EXTENSIONS | IMAGE_EXTENSIONS | ANIMATED_EXTENSIONS
 
+# 全部为短片段时合并到同一个 ffmpeg 进程中转换，分摊进程启动开销
+SHORT_CLIP_MAX_MS = 10_000
+SHORT_CLIP_BATCH_SIZE = 8
+
+# 序列帧文件名：前缀 + 帧号 + 扩展名
+_FRAME_NAME_PATTERN = re.compile(r"(.*?)(\d+)(\.[^.]+)$")
+
+# 按 (路径, mtime, 大小) 缓存的 Excel 首行变量数量
+EXCEL_HEADER_CACHE_SIZE = 32
+
+EXPORT_FORMAT_ORDER = ("gif", "apng", "png_sequence")
+
+# 添加文件时并行运行的 ffprobe 数量，耗时主要在进程启动而非 CPU
+PROBE_WORKERS = 8
+
+# HTML 模板只应是小文件，超出上限时拒绝导入，避免误选大文件卡住界面
+TEMPLATE_MAX_BYTES = 2 * 1024 * 1024
+
+# 文件对话框不为每个条目读取自定义图标、不解析符号链接，避免网络目录下逐个 stat
+_DIALOG_OPTIONS = (
+    QFileDialog.Option.DontUseCustomDirectoryIcons
+    | QFileDialog.Option.DontResolveSymlinks
+)
+_OPEN_DIALOG_OPTIONS = _DIALOG_OPTIONS | QFileDialog.Option.ReadOnly
+_DIRECTORY_DIALOG_OPTIONS = _DIALOG_OPTIONS | QFileDialog.Option.ShowDirsOnly
+
+
+class AddCandidate(NamedTuple):
+    path: Path
+    key: tuple[int, int] | str
+    suffix: str
+
+
+class ExcelHeaders(NamedTuple):
+    path: str
+    cache_key: tuple[str, int, int]
+    headers: list[str]
+    duplicates: list[str]
+
 
 class SequenceInfo(NamedTuple):
     pattern: str
@@ -90,6 +141,9 @@ class SequenceInfo(NamedTuple):
 
 
 class ConversionWorker(QThread):
+    # 进度信号最短间隔（约 30 Hz），每次更新都会刷新进度条并追加日志
+    PROGRESS_INTERVAL_NS = 33_000_000
+
     progress_signal = Signal(object)
     log_signal = Signal(str)
     error_signal = Signal(str)
@@ -102,6 +156,7 @@ class ConversionWorker(QThread):
         self._signals = ControlSignals()
         self._signals.pause_event.set()
         self._pause_btn_state = False
+        self._last_progress_ns = 0
 
     def pause(self) -> None:
         self._signals.request_pause()
@@ -132,40 +187,76 @@ class ConversionWorker(QThread):
             self.finished_signal.emit()
 
     def _forward_progress(self, progress: ConversionProgress) -> None:
-        while (
-            not self._signals.pause_event.is_set()
-            and not self._signals.cancel_event.is_set()
-        ):
-            time.sleep(0.1)
-        if self._signals.cancel_event.is_set():
-            raise ConversionCancelled
+        # 取消由转换器在任务与进度检查点统一抛出，这里只需不再转发进度
+        if self._signals.wait_if_paused():
+            return
+        # 并行转换时多个任务同时上报进度，丢弃间隔过短的中间更新，任务起止始终转发
+        now = time.monotonic_ns()
+        if not progress.is_boundary and now - self._last_progress_ns < self.PROGRESS_INTERVAL_NS:
+            return
+        self._last_progress_ns = now
         self.progress_signal.emit(progress)
 
 
-class ConversionCancelled(Exception):
-    """用户取消转换时抛出的异常。"""
+class _ExcelLogStream(io.TextIOBase):
+    """Forward printed lines to the UI, coalescing bursts into one signal per interval."""
 
+    # 逐行跨线程发信号会让每一行都经过一次 Qt 事件循环与一次重绘，
+    # 连续输出的多行合并后一次发送
+    _EMIT_INTERVAL = 0.05
 
-class _ExcelLogStream(io.TextIOBase):
-    def __init__(self, emit_line):
+    def __init__(self, emit_text, schedule_flush):
         super().__init__()
-        self._emit_line = emit_line
-        self._buffer = ""
+        self._emit_text = emit_text
+        # 在 UI 线程安排一次延迟的 flush_pending，保证间隔内的末尾几行不会滞留
+        self._schedule_flush = schedule_flush
+        self._lock = threading.Lock()
+        # 尚未遇到换行的片段，拼接推迟到整行完成时一次进行
+        self._partial: list[str] = []
+        self._pending: list[str] = []
+        self._last_emit = 0.0
+        self._flush_scheduled = False
 
     def write(self, text):  # type: ignore[override]
         if not text:
             return 0
-        self._buffer += text.replace("\r\n", "\n").replace("\r", "\n")
-        while "\n" in self._buffer:
-            line, self._buffer = self._buffer.split("\n", 1)
-            if line:
-                self._emit_line(line)
+        normalized = text.replace("\r\n", "\n").replace("\r", "\n")
+        self._partial.append(normalized)
+        if "\n" not in normalized:
+            return len(text)
+
+        *lines, tail = "".join(self._partial).split("\n")
+        self._partial = [tail] if tail else []
+        with self._lock:
+            self._pending.extend(line for line in lines if line)
+            if not self._pending:
+                return len(text)
+            if time.monotonic() - self._last_emit >= self._EMIT_INTERVAL:
+                self._emit_pending()
+            elif not self._flush_scheduled:
+                self._flush_scheduled = True
+                self._schedule_flush()
         return len(text)
 
     def flush(self):  # type: ignore[override]
-        if self._buffer:
-            self._emit_line(self._buffer)
-            self._buffer = ""
+        if self._partial:
+            with self._lock:
+                self._pending.append("".join(self._partial))
+            self._partial = []
+        self.flush_pending()
+
+    def flush_pending(self) -> None:
+        """Emit buffered complete lines; safe to call from any thread."""
+
+        with self._lock:
+            self._flush_scheduled = False
+            if self._pending:
+                self._emit_pending()
+
+    def _emit_pending(self) -> None:
+        self._emit_text("\n".join(self._pending))
+        self._pending = []
+        self._last_emit = time.monotonic()
 
 
 class ExcelWorker(QThread):
@@ -173,6 +264,7 @@ class ExcelWorker(QThread):
     success_signal = Signal(str)
     error_signal = Signal(str)
     finished_signal = Signal()
+    _flush_requested = Signal()
 
     def __init__(
         self,
@@ -186,9 +278,17 @@ class ExcelWorker(QThread):
         self._output_path = output_path
         self._template_text = template_text
         self._template_path = template_path
+        self._stream = _ExcelLogStream(self.log_signal.emit, self._flush_requested.emit)
+        # 工作线程没有事件循环，定时器放在 UI 线程：
+        # 例如保存文件前的提示行即使之后长时间没有新输出也能及时显示
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(int(_ExcelLogStream._EMIT_INTERVAL * 1000))
+        self._flush_timer.timeout.connect(self._stream.flush_pending)
+        self._flush_requested.connect(self._flush_timer.start)
 
     def run(self) -> None:  # pragma: no cover - UI thread
-        stream = _ExcelLogStream(self.log_signal.emit)
+        stream = self._stream
         try:
             with redirect_stdout(stream):
                 execute_excel_template(
@@ -214,81 +314,519 @@ class ExcelWorker(QThread):
             self.finished_signal.emit()
 
 
-class HTMLTemplateHighlighter(QSyntaxHighlighter):
-    """HTML模板语法高亮器，支持HTML标签和变量占位符高亮。"""
+class ProbeResult(NamedTuple):
+    candidates: list[AddCandidate]
+    metadata: dict  # 路径 -> 探测结果元组或异常
+    sequences: dict[Path, SequenceInfo]  # 序列帧路径 -> 所属序列
+    error: Optional[str] = None  # 读取过程中断时的错误信息
 
-    def __init__(self, document):
-        super().__init__(document)
 
-        # 定义高亮格式
-        # 变量占位符格式 {variable}
-        self.variable_format = QTextCharFormat()
-        self.variable_format.setForeground(QColor("#FF6B6B"))  # 红色
-        self.variable_format.setFontWeight(QFont.Bold)
+class ProbeWorker(QThread):
+    """Stat, probe and group newly added files on a background thread pool."""
 
-        # HTML标签格式 <tag>
-        self.tag_format = QTextCharFormat()
-        self.tag_format.setForeground(QColor("#4ECDC4"))  # 青色
-        self.tag_format.setFontWeight(QFont.Bold)
+    probing_signal = Signal(int)
+    results_signal = Signal(object)
 
-        # HTML属性名格式
-        self.attribute_name_format = QTextCharFormat()
-        self.attribute_name_format.setForeground(QColor("#95E1D3"))  # 浅青色
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        known_keys: frozenset,
+        known_paths: frozenset[str],
+    ):
+        super().__init__()
+        self._paths = paths
+        self._known_keys = known_keys
+        self._known_paths = known_paths
 
-        # HTML属性值格式
-        self.attribute_value_format = QTextCharFormat()
-        self.attribute_value_format.setForeground(QColor("#F38181"))  # 浅红色
+    def run(self) -> None:  # pragma: no cover - UI thread
+        # 无论出现何种异常都要发出结果，否则界面会一直停留在读取状态
+        try:
+            result = self._probe()
+        except Exception as exc:  # noqa: BLE001
+            result = ProbeResult([], {}, {}, str(exc) or type(exc).__name__)
+        self.results_signal.emit(result)
+
+    def _probe(self) -> ProbeResult:
+        candidates = self._collect_candidates()
+
+        # 视频、GIF 与 APNG 需要 ffprobe，并行探测；静态 PNG 只需读取块头即可排除
+        jobs = [
+            (path, suffix not in VIDEO_EXTENSIONS)
+            for path, _, suffix in candidates
+            if suffix in VIDEO_EXTENSIONS
+            or suffix in ANIMATED_EXTENSIONS
+            or (suffix == ".png" and is_animated_png(path))
+        ]
+
+        def probe(job: tuple[Path, bool]):
+            path, animated = job
+            try:
+                if animated:
+                    return probe_animated_image_metadata(path)
+                return probe_video_metadata(path)
+            except Exception as exc:  # noqa: BLE001
+                return exc
+
+        metadata: dict = {}
+        if jobs:
+            self.probing_signal.emit(len(jobs))
+            workers = max(1, min(PROBE_WORKERS, len(jobs)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                metadata = dict(zip((path for path, _ in jobs), executor.map(probe, jobs)))
+            flush_probe_cache()
+
+        return ProbeResult(candidates, metadata, self._group_sequences(candidates, metadata))
+
+    def _collect_candidates(self) -> list[AddCandidate]:
+        candidates: list[AddCandidate] = []
+        seen: set[tuple[int, int] | str] = set()
+        for path in self._paths:
+            # 已添加过的路径按字符串直接跳过，重复添加同一文件夹时无需逐个 stat
+            path_key = os.path.normcase(os.path.abspath(path))
+            if path_key in self._known_paths:
+                continue
+            # 一次 stat 同时确认文件存在并取得去重键，不再逐级解析符号链接
+            try:
+                stat_result = path.stat()
+            except OSError:
+                continue
+            # 部分 Windows 网络共享不提供 inode（恒为 0），此时退回按路径去重
+            if stat_result.st_ino:
+                key = (stat_result.st_dev, stat_result.st_ino)
+            else:
+                key = path_key
+            # 去重放在探测之前，重复添加的文件不再启动 ffprobe
+            if key in self._known_keys or key in seen:
+                continue
+            seen.add(key)
+            candidates.append(AddCandidate(path.absolute(), key, path.suffix.lower()))
+        return candidates
+
+    @staticmethod
+    def _group_sequences(
+        candidates: list[AddCandidate], metadata: dict
+    ) -> dict[Path, SequenceInfo]:
+        sequences: dict[Path, SequenceInfo] = {}
+        groups: dict[tuple[Path, str, str], SequenceInfo | None] = {}
+        listings: dict[Path, dict[tuple[str, str], list[tuple[int, str]]]] = {}
+        for path, _, suffix in candidates:
+            if suffix not in IMAGE_EXTENSIONS:
+                continue
+            result = metadata.get(path)
+            # 多帧 PNG 按 APNG 处理，不参与序列检测
+            if suffix == ".png" and isinstance(result, tuple) and result[3] and result[3] > 1:
+                continue
+            match = _FRAME_NAME_PATTERN.match(path.name)
+            if not match:
+                continue
+            # 同一序列的各帧共享一次目录扫描
+            group_key = (path.parent, match.group(1), match.group(3))
+            if group_key not in groups:
+                try:
+                    groups[group_key] = _detect_sequence(path, listings)
+                except OSError:
+                    groups[group_key] = None
+            sequence = groups[group_key]
+            if sequence:
+                sequences[path] = sequence
+        return sequences
+
+
+def _walk_media(root: Path, extensions: Iterable[str]) -> Iterator[Path]:
+    """Yield files under ``root`` whose suffix is in ``extensions``.
+
+    Uses ``os.scandir`` so the type of most entries comes from the directory
+    listing itself; only symlinks need an extra ``stat``. Like ``rglob`` it
+    does not descend into symlinked directories.
+    """
+
+    wanted = frozenset(extensions)
+    stack = [root]
+    while stack:
+        try:
+            iterator = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with iterator:
+            for entry in iterator:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif os.path.splitext(entry.name)[1].lower() in wanted and entry.is_file():
+                    yield Path(entry.path)
+
+
+def _detect_sequence(
+    frame_path: Path,
+    listings: dict[Path, dict[tuple[str, str], list[tuple[int, str]]]] | None = None,
+) -> SequenceInfo | None:
+    match = _FRAME_NAME_PATTERN.match(frame_path.name)
+    if not match:
+        return None
+
+    prefix, number_str, extension = match.groups()
+    padding = len(number_str)
+    directory = frame_path.parent
+
+    # 同一目录下可能有多组序列，一次添加中每个目录只列举并分组一次，之后按 (前缀, 扩展名) 直接查找
+    groups = listings.get(directory) if listings is not None else None
+    if groups is None:
+        groups = {}
+        with os.scandir(directory) as iterator:
+            # scandir 的目录项自带并缓存文件类型，先按名称过滤，避免对每个文件单独 stat 与解析路径
+            for entry in iterator:
+                # 前缀为最短匹配，同一序列的帧拆分出的前缀与扩展名必然一致
+                candidate_match = _FRAME_NAME_PATTERN.match(entry.name)
+                if not candidate_match or not entry.is_file():
+                    continue
+                groups.setdefault(
+                    (candidate_match.group(1), candidate_match.group(3)), []
+                ).append((int(candidate_match.group(2)), entry.path))
+        if listings is not None:
+            listings[directory] = groups
+
+    frames = groups.get((prefix, extension), [])
+    if len(frames) < 2:
+        return None
+
+    start_number, first_path = min(frames)
+    first_frame = Path(first_path).resolve()
+    frame_count = len(frames)
+    pattern = str(directory / f"{prefix}%0{padding}d{extension}")
+    prefix_name = (
+        prefix.rstrip("_- ")
+        or prefix
+        or first_frame.parent.name
+        or first_frame.stem
+    )
+
+    return SequenceInfo(
+        pattern=pattern,
+        first_frame=first_frame,
+        extension=extension,
+        start_number=start_number,
+        frame_count=frame_count,
+        prefix=prefix_name,
+        padding=padding,
+    )
+
+
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_RELATIONSHIP_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def _package_part(base_dir: str, target: str) -> str:
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _read_relationships(archive: zipfile.ZipFile, part: str) -> list[ElementTree.Element]:
+    rels_part = posixpath.join(
+        posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels"
+    )
+    return list(ElementTree.fromstring(archive.read(rels_part)))
+
+
+def _plain_text(node: ElementTree.Element) -> str:
+    # 与 openpyxl 一致：直接的 <t> 加上各富文本片段的 <t>，忽略注音 <rPh>
+    parts = [node.findtext(f"{_SHEET_NS}t") or ""]
+    parts.extend(run.findtext(f"{_SHEET_NS}t") or "" for run in node.iterfind(f"{_SHEET_NS}r"))
+    return "".join(parts)
+
+
+def _read_header_row_fast(path: str) -> Optional[list]:
+    """Read the first row of the active sheet straight from the xlsx package.
+
+    Returns None when the row holds values this reader does not convert
+    (numbers, dates), so the caller can fall back to openpyxl.
+    """
+
+    with zipfile.ZipFile(path) as archive:
+        workbook_part = next(
+            _package_part("", rel.get("Target", ""))
+            for rel in ElementTree.fromstring(archive.read("_rels/.rels"))
+            if rel.get("Type", "").endswith("/officeDocument")
+        )
+        base_dir = posixpath.dirname(workbook_part)
+        workbook = ElementTree.fromstring(archive.read(workbook_part))
+        relationships = _read_relationships(archive, workbook_part)
+
+        active = 0
+        for view in workbook.iter(f"{_SHEET_NS}workbookView"):
+            if view.get("activeTab") is not None:
+                active = int(view.get("activeTab"))
+                break
+        sheets = [
+            sheet for sheet in workbook.iter(f"{_SHEET_NS}sheet") if sheet.get(_RELATIONSHIP_ID)
+        ]
+        sheet_id = sheets[active].get(_RELATIONSHIP_ID)
+        sheet_rel = next(rel for rel in relationships if rel.get("Id") == sheet_id)
+        if not sheet_rel.get("Type", "").endswith("/worksheet"):
+            return None
 
-        # 定义正则表达式规则
-        self.highlighting_rules = []
+        cells: list[tuple[str, Optional[str]]] = []
+        # 只解析到首行结束，不加载整张工作表
+        with archive.open(_package_part(base_dir, sheet_rel.get("Target", ""))) as stream:
+            for _, element in ElementTree.iterparse(stream):
+                if element.tag != f"{_SHEET_NS}row":
+                    continue
+                if element.get("r", "1") != "1":
+                    break
+                for cell in element.iterfind(f"{_SHEET_NS}c"):
+                    kind = cell.get("t", "n")
+                    if kind == "inlineStr":
+                        node = cell.find(f"{_SHEET_NS}is")
+                        cells.append(("str", None if node is None else _plain_text(node)))
+                    else:
+                        cells.append((kind, cell.findtext(f"{_SHEET_NS}v") or None))
+                break
+
+        values: list = []
+        indices: list[int] = []
+        for kind, raw in cells:
+            if raw is None:
+                values.append(None)
+            elif kind == "s":
+                indices.append(int(raw))
+                values.append(indices[-1])
+            elif kind == "b":
+                values.append(bool(int(raw)))
+            elif kind in {"str", "e"}:
+                values.append(raw)
+            else:
+                return None
+        if not indices:
+            return values
 
-        # 变量占位符规则: {variable_name}
-        self.highlighting_rules.append((
-            QRegularExpression(r"\{[^{}]+\}"),
-            self.variable_format
-        ))
+        # 共享字符串表可能远大于首行所需，读到首行引用的最大序号即停止
+        sst_rel = next(
+            rel for rel in relationships if rel.get("Type", "").endswith("/sharedStrings")
+        )
+        last_index = max(indices)
+        strings: list[str] = []
+        with archive.open(_package_part(base_dir, sst_rel.get("Target", ""))) as stream:
+            for _, element in ElementTree.iterparse(stream):
+                if element.tag != f"{_SHEET_NS}si":
+                    continue
+                strings.append(_plain_text(element).replace("x005F_", ""))
+                element.clear()
+                if len(strings) > last_index:
+                    break
+
+    for position, (kind, raw) in enumerate(cells):
+        if kind == "s" and raw is not None:
+            values[position] = strings[values[position]]
+    return values
+
+
+def _read_excel_headers(path: str) -> tuple[list[str], list[str]]:
+    """Return the template variables in the first row and the sorted duplicate names."""
+
+    try:
+        header_row = _read_header_row_fast(path)
+    except (
+        KeyError,
+        IndexError,
+        StopIteration,
+        ValueError,
+        zipfile.BadZipFile,
+        ElementTree.ParseError,
+    ):
+        # 结构不常见的文件交给 openpyxl 处理，出错时也由它给出原本的错误信息
+        header_row = None
+    if header_row is None:
+        header_row = _read_header_row_openpyxl(path)
+
+    # dict 保留插入顺序，去重查找不再随列数线性增长
+    headers: dict[str, None] = {}
+    duplicates: set[str] = set()
+    for value in header_row:
+        if value is None:
+            continue
+        header = str(value).strip()
+        if not header or header == RESULT_HEADER:
+            continue
+        if header in headers:
+            duplicates.add(header)
+            continue
+        headers[header] = None
+    return list(headers), sorted(duplicates)
+
+
+def _read_header_row_openpyxl(path: str) -> tuple:
+    # openpyxl 导入较慢，推迟到首次读取 Excel 时再加载
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        # 部分程序写出的 dimension 标记有误（过大或只有 A1），忽略它以按实际内容读取首行
+        sheet.reset_dimensions()
+        # 只读模式下 sheet.cell 每次都会重新解析工作表，改为只取首行一次
+        return next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    finally:
+        workbook.close()
+
+
+class HeaderProbeWorker(QThread):
+    """Read the Excel header row off the UI thread."""
+
+    headers_signal = Signal(object)
+    error_signal = Signal(str, str)
+
+    def __init__(self, path: str, cache_key: tuple[str, int, int]):
+        super().__init__()
+        self._path = path
+        self._cache_key = cache_key
 
-        # HTML标签规则: <tag> </tag> <tag/>
-        self.highlighting_rules.append((
-            QRegularExpression(r"</?[a-zA-Z][a-zA-Z0-9]*(?:\s|/?>)"),
-            self.tag_format
-        ))
+    def run(self) -> None:  # pragma: no cover - UI thread
+        try:
+            headers, duplicates = _read_excel_headers(self._path)
+        except Exception as exc:  # noqa: BLE001
+            self.error_signal.emit(self._path, str(exc))
+        else:
+            self.headers_signal.emit(
+                ExcelHeaders(self._path, self._cache_key, headers, duplicates)
+            )
 
-        # HTML标签结束符 >
-        self.highlighting_rules.append((
-            QRegularExpression(r"/?>"),
-            self.tag_format
-        ))
 
-        # HTML属性名规则
-        self.highlighting_rules.append((
-            QRegularExpression(r'\b[a-zA-Z-]+(?==)'),
-            self.attribute_name_format
-        ))
+def _char_format(color: str, bold: bool = False) -> QTextCharFormat:
+    char_format = QTextCharFormat()
+    char_format.setForeground(QColor(color))
+    if bold:
+        char_format.setFontWeight(QFont.Bold)
+    return char_format
 
-        # HTML属性值规则（双引号）
-        self.highlighting_rules.append((
-            QRegularExpression(r'"[^"]*"'),
-            self.attribute_value_format
-        ))
 
+def _build_highlight_pattern() -> tuple[QRegularExpression, tuple[QTextCharFormat, ...]]:
+    """Compile all HTML template rules into one alternation matched in a single pass.
+
+    Each rule becomes a named group; the index of the group that matched picks
+    the format, so every block is scanned once instead of once per rule.
+    """
+
+    # 定义高亮格式
+    variable_format = _char_format("#FF6B6B", bold=True)  # 变量占位符 {variable}，红色
+    tag_format = _char_format("#4ECDC4", bold=True)  # HTML标签 <tag>，青色
+    attribute_name_format = _char_format("#95E1D3")  # HTML属性名，浅青色
+    attribute_value_format = _char_format("#F38181")  # HTML属性值，浅红色
+
+    # 各规则的起始字符互不相同，合并后同一位置只可能命中一条规则
+    rules = (
+        # 变量占位符规则: {variable_name}
+        ("var", r"\{[^{}]+\}", variable_format),
+        # HTML标签规则: <tag> </tag> <tag/>
+        ("tag", r"</?[a-zA-Z][a-zA-Z0-9]*(?:\s|/?>)", tag_format),
+        # HTML标签结束符 >
+        ("tag_end", r"/?>", tag_format),
+        # HTML属性名规则
+        ("attr", r"\b[a-zA-Z-]+(?==)", attribute_name_format),
+        # HTML属性值规则（双引号）
+        ("dq", r'"[^"]*"', attribute_value_format),
         # HTML属性值规则（单引号）
-        self.highlighting_rules.append((
-            QRegularExpression(r"'[^']*'"),
-            self.attribute_value_format
-        ))
+        ("sq", r"'[^']*'", attribute_value_format),
+    )
+
+    expression = QRegularExpression(
+        "|".join(f"(?<{name}>{pattern})" for name, pattern, _ in rules)
+    )
+    # 立即编译（含 JIT），避免每个文档首次高亮时再编译
+    expression.optimize()
+    # 分组编号从 1 开始，0 号位置对应整体匹配，不会被使用
+    formats = (QTextCharFormat(), *(char_format for _, _, char_format in rules))
+    return expression, formats
+
+
+_HIGHLIGHT_PATTERN, _HIGHLIGHT_FORMATS = _build_highlight_pattern()
+
+
+# 超长的单行（例如粘贴的压缩 HTML）逐字符匹配代价高，每次编辑都会卡顿，直接跳过高亮
+_HIGHLIGHT_MAX_BLOCK_LENGTH = 4096
+
+
+@functools.lru_cache(maxsize=4096)
+def _highlight_spans(text: str) -> tuple[tuple[int, int, int], ...]:
+    """Return ``(start, length, format_index)`` spans for one line of template text."""
+
+    spans = []
+    match_iterator = _HIGHLIGHT_PATTERN.globalMatch(text)
+    while match_iterator.hasNext():
+        match = match_iterator.next()
+        spans.append((match.capturedStart(), match.capturedLength(), match.lastCapturedIndex()))
+    return tuple(spans)
+
+
+class HTMLTemplateHighlighter(QSyntaxHighlighter):
+    """HTML模板语法高亮器，支持HTML标签和变量占位符高亮。"""
 
     def highlightBlock(self, text: str) -> None:
         """对文本块应用语法高亮。"""
-        for pattern, format_style in self.highlighting_rules:
-            match_iterator = pattern.globalMatch(text)
-            while match_iterator.hasNext():
-                match = match_iterator.next()
-                self.setFormat(
-                    match.capturedStart(),
-                    match.capturedLength(),
-                    format_style
-                )
+        # 编辑时未改动的行会被反复高亮，按行文本缓存匹配结果，命中时只需重放格式
+        if len(text) > _HIGHLIGHT_MAX_BLOCK_LENGTH:
+            return
+        formats = _HIGHLIGHT_FORMATS
+        for start, length, format_index in _highlight_spans(text):
+            self.setFormat(start, length, formats[format_index])
+
+
+class _LogBuffer:
+    """Append log lines to a text view at most once per frame."""
+
+    # 每次 append 都会重新排版整个文档，约 30 Hz 合并一次
+    FLUSH_INTERVAL_MS = 33
+    # 只保留最近的日志行，长时间转换时文档大小有上限
+    MAX_BLOCKS = 2000
+
+    def __init__(self, view: QPlainTextEdit):
+        self._view = view
+        view.setReadOnly(True)
+        view.setMaximumBlockCount(self.MAX_BLOCKS)
+        self._lines: list[str] = []
+        self._timer = QTimer(view)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)  # type: ignore[arg-type]
+
+    def append(self, message: str) -> None:
+        self._lines.append(message)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        if not self._lines:
+            return
+        self._view.appendPlainText("\n".join(self._lines))
+        self._lines.clear()
+        self._view.moveCursor(QTextCursor.End)
+
+    def clear(self) -> None:
+        self._timer.stop()
+        self._lines.clear()
+        self._view.clear()
+
+
+def _task_tooltip(task: ConversionTask) -> str:
+    tooltip_parts = [f"输出: {task.output_stem}"]
+    tooltip_parts.append(task.sequence_pattern or str(task.source))
+    if task.total_frames:
+        tooltip_parts.append(f"帧数: {task.total_frames}")
+    if task.duration_ms:
+        tooltip_parts.append(f"时长: {task.duration_ms / 1000:.2f}s")
+    return " | ".join(tooltip_parts)
+
+
+class FileListWidget(QListWidget):
+    """List of conversion tasks whose tooltips are built on first hover."""
+
+    def viewportEvent(self, event: QEvent) -> bool:  # type: ignore[override]
+        # 大批量添加时不预先生成提示文本，鼠标悬停到条目上时才根据任务生成
+        if event.type() == QEvent.Type.ToolTip:
+            item = self.itemAt(event.pos())
+            if item is not None and not item.toolTip():
+                task = item.data(Qt.ItemDataRole.UserRole)
+                if task is not None:
+                    item.setToolTip(_task_tooltip(task))
+        return super().viewportEvent(event)
 
 
 class FileDropLineEdit(QLineEdit):
@@ -299,16 +837,19 @@ class FileDropLineEdit(QLineEdit):
     ):
         super().__init__(parent)
         self.setAcceptDrops(True)
-        self._filters = tuple(f.lower() for f in filters) if filters else ()
+        self._filters = frozenset(f.lower() for f in filters) if filters else frozenset()
+        self._drag_accepted = False
 
     def dragEnterEvent(self, event: QDragEnterEvent) -> None:  # type: ignore[override]
-        if self._has_valid_urls(event.mimeData()):
+        # 拖拽过程中内容不会变化，进入时判断一次，移动事件直接复用结果
+        self._drag_accepted = self._has_valid_urls(event.mimeData())
+        if self._drag_accepted:
             event.acceptProposedAction()
         else:
             event.ignore()
 
     def dragMoveEvent(self, event: QDragEnterEvent) -> None:  # type: ignore[override]
-        if self._has_valid_urls(event.mimeData()):
+        if self._drag_accepted:
             event.acceptProposedAction()
         else:
             event.ignore()
@@ -318,12 +859,10 @@ class FileDropLineEdit(QLineEdit):
             event.ignore()
             return
         for url in event.mimeData().urls():
-            path = Path(url.toLocalFile())
-            if not path:
-                continue
-            if self._filters and path.suffix.lower() not in self._filters:
+            local_file = url.toLocalFile()
+            if not self._accepts(local_file):
                 continue
-            self.setText(str(path))
+            self.setText(str(Path(local_file)))
             event.acceptProposedAction()
             return
         event.ignore()
@@ -331,13 +870,37 @@ class FileDropLineEdit(QLineEdit):
     def _has_valid_urls(self, mime_data: QMimeData) -> bool:
         if not mime_data.hasUrls():
             return False
-        for url in mime_data.urls():
-            path = Path(url.toLocalFile())
-            if not path:
-                continue
-            if not self._filters or path.suffix.lower() in self._filters:
-                return True
-        return False
+        return any(self._accepts(url.toLocalFile()) for url in mime_data.urls())
+
+    def _accepts(self, local_file: str) -> bool:
+        # 非本地 URL 返回空串；只需扩展名时不必构造 Path
+        if not local_file:
+            return False
+        return not self._filters or os.path.splitext(local_file)[1].lower() in self._filters
+
+
+@functools.lru_cache(maxsize=1)
+def _default_output_directory() -> Path:
+    # 每次显示窗口都可能用到，结果在进程内不变，只查询一次
+    home = Path.home()
+    downloads = home / "Downloads"
+    if downloads.exists():
+        return downloads
+    if sys.platform.startswith("win"):
+        from ctypes import windll, wintypes, create_unicode_buffer
+
+        CSIDL_PERSONAL = 0x0005
+        SHGFP_TYPE_CURRENT = 0
+        buf = create_unicode_buffer(wintypes.MAX_PATH)
+        result = windll.shell32.SHGetFolderPathW(
+            None, CSIDL_PERSONAL, None, SHGFP_TYPE_CURRENT, buf
+        )
+        if result == 0:
+            documents = Path(buf.value)
+            candidate = documents.parent / "Downloads"
+            if candidate.exists():
+                return candidate
+    return home
 
 
 class MainWindow(QWidget):
@@ -349,7 +912,7 @@ class MainWindow(QWidget):
 
         self._tab_widget = QTabWidget()
 
-        self._files_list = QListWidget()
+        self._files_list = FileListWidget()
         self._output_edit = QLineEdit()
         self._width_edit = QLineEdit()
         self._height_edit = QLineEdit()
@@ -371,8 +934,8 @@ class MainWindow(QWidget):
         self._export_gif.setChecked(True)
         self._export_apng.setChecked(True)
 
-        self._log_view = QTextEdit()
-        self._log_view.setReadOnly(True)
+        self._log_view = QPlainTextEdit()
+        self._log = _LogBuffer(self._log_view)
         self._overall_progress = QProgressBar()
         self._current_progress = QProgressBar()
         self._elapsed_label = QLabel("总耗时: --")
@@ -394,7 +957,11 @@ class MainWindow(QWidget):
         self._cancel_btn.setEnabled(True)
 
         self._worker: ConversionWorker | None = None
-        self._file_set: set[str] = set()
+        self._probe_worker: ProbeWorker | None = None
+        self._queued_paths: list[Path] = []
+        # 文件按 (设备号, inode) 去重，经由不同符号链接添加的同一文件只保留一份；图片序列按模式串去重
+        self._file_set: set[tuple[int, int] | str] = set()
+        self._added_paths: set[str] = set()
         self._tasks: list[ConversionTask] = []
         self._defaults_applied = False
         self._start_time: float | None = None
@@ -406,8 +973,8 @@ class MainWindow(QWidget):
         self._excel_input_btn = QPushButton("选择输入文件")
         self._excel_output_btn = QPushButton("选择输出文件")
         self._excel_run_btn = QPushButton("开始处理")
-        self._excel_log_view = QTextEdit()
-        self._excel_log_view.setReadOnly(True)
+        self._excel_log_view = QPlainTextEdit()
+        self._excel_log = _LogBuffer(self._excel_log_view)
         self._excel_run_btn.setEnabled(False)
         self._excel_output_edit.setPlaceholderText("留空则覆盖输入文件")
         self._excel_template_edit = QTextEdit()
@@ -430,6 +997,14 @@ class MainWindow(QWidget):
         self._excel_variables_list.addItem("请选择 Excel 输入文件以加载变量")
 
         self._excel_worker: ExcelWorker | None = None
+        self._header_workers: set[HeaderProbeWorker] = set()
+        self._excel_header_cache: OrderedDict[
+            tuple[str, int, int], tuple[list[str], list[str]]
+        ] = OrderedDict()
+        self._excel_variables_timer = QTimer(self)
+        self._excel_variables_timer.setSingleShot(True)
+        self._excel_variables_timer.setInterval(250)
+        self._excel_variables_timer.timeout.connect(self._update_excel_variables)  # type: ignore[arg-type]
         self._excel_template_path: Optional[str] = None
         self._excel_template_updating = False
 
@@ -576,6 +1151,7 @@ class MainWindow(QWidget):
             "选择媒体文件",
             "",
             "媒体文件 (*.mp4 *.mov *.m4v *.mpg *.mpeg *.gif *.png)",
+            options=_OPEN_DIALOG_OPTIONS,
         )
 
         self._add_paths(Path(path) for path in paths)
@@ -583,30 +1159,37 @@ class MainWindow(QWidget):
     def _on_clear_files(self) -> None:
         self._files_list.clear()
         self._file_set.clear()
+        self._added_paths.clear()
         self._tasks.clear()
         self._defaults_applied = False
         self._width_edit.clear()
         self._height_edit.clear()
         self._fps_edit.clear()
-        self._overall_progress.setValue(0)
-        self._current_progress.setValue(0)
-        self._elapsed_label.setText("总耗时: --")
-        self._set_controls_stopped()
+        # 转换进行中只清空列表：本次转换使用开始时的任务快照，进度与控制按钮保持不变
+        if self._worker is None:
+            self._overall_progress.setValue(0)
+            self._current_progress.setValue(0)
+            self._elapsed_label.setText("总耗时: --")
+            self._set_controls_stopped()
         self._update_start_state()
 
     def _on_browse_output(self) -> None:
-        directory = QFileDialog.getExistingDirectory(self, "选择输出目录")
+        directory = QFileDialog.getExistingDirectory(
+            self, "选择输出目录", options=_DIRECTORY_DIALOG_OPTIONS
+        )
         if directory:
             self._output_edit.setText(directory)
             self._update_start_state()
 
     def _on_add_folder(self) -> None:
-        directory = QFileDialog.getExistingDirectory(self, "选择视频所在文件夹")
+        directory = QFileDialog.getExistingDirectory(
+            self, "选择视频所在文件夹", options=_DIRECTORY_DIALOG_OPTIONS
+        )
         if not directory:
             return
 
         folder_path = Path(directory)
-        paths = (path for path in folder_path.rglob("*") if path.is_file())
+        paths = _walk_media(folder_path, SUPPORTED_EXTENSIONS)
         self._add_paths(paths)
 
     def _update_start_state(self) -> None:
@@ -615,8 +1198,7 @@ class MainWindow(QWidget):
         self._start_btn.setEnabled(has_files and has_output and self._worker is None)
 
     def _append_log(self, message: str) -> None:
-        self._log_view.append(message)
-        self._log_view.moveCursor(QTextCursor.End)
+        self._log.append(message)
 
     def _on_progress(self, progress: ConversionProgress) -> None:
         overall_percent = int(min(max(progress.overall_progress * 100, 0), 100))
@@ -634,7 +1216,7 @@ class MainWindow(QWidget):
             QMessageBox.warning(self, "参数错误", str(exc))
             return
 
-        self._log_view.clear()
+        self._log.clear()
         self._append_log("开始转换...")
         self._start_btn.setEnabled(False)
         self._pause_btn.setEnabled(True)
@@ -696,7 +1278,8 @@ class MainWindow(QWidget):
         scale_mode = self._scale_mode_combo.currentData()
 
         return ConversionRequest(
-            tasks=self._tasks,
+            # 开始时固定任务列表，运行中添加或清空文件不会改变本次转换的内容与进度总数
+            tasks=list(self._tasks),
             output_dir=output_dir,
             width=width,
             height=height,
@@ -704,62 +1287,94 @@ class MainWindow(QWidget):
             quality=quality,
             scale_mode=scale_mode,
             export_formats=self._gather_export_formats(),
+            batch_size=self._conversion_batch_size(),
         )
 
+    def _conversion_batch_size(self) -> int:
+        if self._tasks and all(
+            task.duration_ms and task.duration_ms <= SHORT_CLIP_MAX_MS for task in self._tasks
+        ):
+            return SHORT_CLIP_BATCH_SIZE
+        return 1
+
     def _gather_export_formats(self) -> tuple[str, ...]:
-        formats: list[str] = []
+        formats: set[str] = set()
         if self._export_gif.isChecked():
-            formats.append("gif")
+            formats.add("gif")
         if self._export_apng.isChecked():
-            formats.append("apng")
+            formats.add("apng")
         if self._export_png_sequence.isChecked():
-            formats.append("png_sequence")
+            formats.add("png_sequence")
         if not formats:
             # 如果没有勾选任何格式，根据源文件格式推断
-            source_formats = set()
             for task in self._tasks:
-                if task.source_format:
-                    source_formats.add(task.source_format)
-
-            # 根据源格式映射到导出格式
-            for src_fmt in source_formats:
-                if src_fmt == "gif":
-                    formats.append("gif")
-                elif src_fmt == "apng":
-                    formats.append("apng")
-                elif src_fmt in ("video", "image_sequence"):
+                src_fmt = task.source_format
+                if src_fmt in ("video", "image_sequence"):
                     # 视频和图片序列默认导出为 GIF 和 APNG
-                    if "gif" not in formats:
-                        formats.append("gif")
-                    if "apng" not in formats:
-                        formats.append("apng")
+                    formats.update(("gif", "apng"))
+                elif src_fmt in ("gif", "apng"):
+                    formats.add(src_fmt)
+                if len(formats) == 2:
+                    break
 
             # 如果还是没有格式（比如没有任务），使用默认格式
             if not formats:
-                formats.extend(DEFAULT_EXPORT_FORMATS)
+                formats.update(DEFAULT_EXPORT_FORMATS)
 
-        return tuple(dict.fromkeys(formats))
+        # 按固定顺序输出，结果不受集合遍历顺序影响
+        return tuple(fmt for fmt in EXPORT_FORMAT_ORDER if fmt in formats)
 
     def _add_paths(self, paths: Iterable[Path]) -> None:
+        if self._probe_worker is not None:
+            # 上一批文件仍在读取参数，完成后再处理
+            self._queued_paths.extend(paths)
+            return
+
+        # stat、APNG 判断、ffprobe 与序列目录扫描都放到后台线程，避免大批文件卡住界面
+        self._add_files_btn.setEnabled(False)
+        self._add_folder_btn.setEnabled(False)
+        self._probe_worker = ProbeWorker(
+            paths, frozenset(self._file_set), frozenset(self._added_paths)
+        )
+        self._probe_worker.probing_signal.connect(self._on_probe_started)
+        self._probe_worker.results_signal.connect(self._on_probe_finished)
+        self._probe_worker.start()
+
+    def _on_probe_started(self, count: int) -> None:
+        self._append_log(f"正在读取 {count} 个文件的参数...")
+
+    def _on_probe_finished(self, result: ProbeResult) -> None:
+        if self._probe_worker is not None:
+            self._probe_worker.wait()
+            self._probe_worker = None
+        self._add_files_btn.setEnabled(True)
+        self._add_folder_btn.setEnabled(True)
+        self._finish_add_paths(result)
+
+        if self._queued_paths:
+            queued, self._queued_paths = self._queued_paths, []
+            self._add_paths(queued)
+
+    def _mark_added(self, key: tuple[int, int] | str, path: Path) -> None:
+        self._file_set.add(key)
+        self._added_paths.add(os.path.normcase(os.path.abspath(path)))
+
+    def _finish_add_paths(self, probe: ProbeResult) -> None:
+        if probe.error:
+            self._append_log(f"⚠️ 读取文件时出错：{probe.error}")
+
         new_tasks: list[ConversionTask] = []
-        for path in paths:
-            normalized = path.resolve()
-            if not normalized.exists():
+        results = probe.metadata
+        for normalized, key, suffix in probe.candidates:
+            if key in self._file_set:
                 continue
 
-            suffix = normalized.suffix.lower()
-            key = str(normalized)
-
             if suffix in VIDEO_EXTENSIONS:
-                if key in self._file_set:
-                    continue
-                try:
-                    width, height, fps, frames, duration = probe_video_metadata(
-                        normalized
-                    )
-                except ConverterError as exc:
-                    self._append_log(f"⚠️ 无法读取 {normalized.name} 的参数：{exc}")
+                result = results[normalized]
+                if isinstance(result, Exception):
+                    self._append_log(f"⚠️ 无法读取 {normalized.name} 的参数：{result}")
                     continue
+                width, height, fps, frames, duration = result
                 task = ConversionTask(
                     display_name=normalized.name,
                     source=normalized,
@@ -767,22 +1382,21 @@ class MainWindow(QWidget):
                     source_format="video",
                     total_frames=frames,
                     duration_ms=duration,
+                    width=width,
+                    height=height,
+                    fps=fps,
                 )
-                self._file_set.add(key)
+                self._mark_added(key, normalized)
                 new_tasks.append(task)
                 continue
 
             # 处理 GIF 动画
             if suffix in ANIMATED_EXTENSIONS:
-                if key in self._file_set:
-                    continue
-                try:
-                    width, height, fps, frames, duration = probe_animated_image_metadata(
-                        normalized
-                    )
-                except ConverterError as exc:
-                    self._append_log(f"⚠️ 无法读取 {normalized.name} 的参数：{exc}")
+                result = results[normalized]
+                if isinstance(result, Exception):
+                    self._append_log(f"⚠️ 无法读取 {normalized.name} 的参数：{result}")
                     continue
+                width, height, fps, frames, duration = result
                 task = ConversionTask(
                     display_name=normalized.name,
                     source=normalized,
@@ -790,38 +1404,38 @@ class MainWindow(QWidget):
                     source_format="gif",
                     total_frames=frames,
                     duration_ms=duration,
+                    width=width,
+                    height=height,
+                    fps=fps,
                 )
-                self._file_set.add(key)
+                self._mark_added(key, normalized)
                 new_tasks.append(task)
                 continue
 
             if suffix in IMAGE_EXTENSIONS:
                 # 尝试检测是否为 APNG（动画 PNG）
-                if suffix == ".png":
-                    try:
-                        width, height, fps, frames, duration = probe_animated_image_metadata(
-                            normalized
+                result = results.get(normalized)
+                # 探测失败时按照普通图片处理
+                if suffix == ".png" and isinstance(result, tuple):
+                    width, height, fps, frames, duration = result
+                    # 如果成功获取帧数且大于1，说明是 APNG
+                    if frames and frames > 1:
+                        task = ConversionTask(
+                            display_name=normalized.name,
+                            source=normalized,
+                            output_stem=normalized.stem,
+                            source_format="apng",
+                            total_frames=frames,
+                            duration_ms=duration,
+                            width=width,
+                            height=height,
+                            fps=fps,
                         )
-                        # 如果成功获取帧数且大于1，说明是 APNG
-                        if frames and frames > 1:
-                            if key in self._file_set:
-                                continue
-                            task = ConversionTask(
-                                display_name=normalized.name,
-                                source=normalized,
-                                output_stem=normalized.stem,
-                                source_format="apng",
-                                total_frames=frames,
-                                duration_ms=duration,
-                            )
-                            self._file_set.add(key)
-                            new_tasks.append(task)
-                            continue
-                    except ConverterError:
-                        # 如果探测失败，按照普通图片处理
-                        pass
-
-                sequence = self._detect_sequence(normalized)
+                        self._mark_added(key, normalized)
+                        new_tasks.append(task)
+                        continue
+
+                sequence = probe.sequences.get(normalized)
                 if sequence:
                     sequence_key = sequence.pattern
                     if sequence_key in self._file_set:
@@ -835,8 +1449,6 @@ class MainWindow(QWidget):
                         new_tasks.append(task)
                     continue
 
-                if key in self._file_set:
-                    continue
                 task = ConversionTask(
                     display_name=normalized.name,
                     source=normalized,
@@ -850,29 +1462,29 @@ class MainWindow(QWidget):
                     start_number=0,
                     duration_ms=150,
                 )
-                self._file_set.add(key)
+                self._mark_added(key, normalized)
                 new_tasks.append(task)
 
         if not new_tasks:
             self._append_log("未添加新的可转换文件")
             return
 
-        for task in new_tasks:
-            item = QListWidgetItem(task.display_name)
-            tooltip_parts = [f"输出: {task.output_stem}"]
-            tooltip_parts.append(task.sequence_pattern or str(task.source))
-            if task.total_frames:
-                tooltip_parts.append(f"帧数: {task.total_frames}")
-            if task.duration_ms:
-                tooltip_parts.append(f"时长: {task.duration_ms / 1000:.2f}s")
-            item.setToolTip(" | ".join(tooltip_parts))
-            item.setData(Qt.ItemDataRole.UserRole, task)
-            self._files_list.addItem(item)
-            self._tasks.append(task)
+        # 一次性插入全部条目再补充数据，避免逐条插入触发多次布局与重绘；提示文本在悬停时生成
+        first_row = self._files_list.count()
+        self._files_list.setUpdatesEnabled(False)
+        try:
+            self._files_list.addItems([task.display_name for task in new_tasks])
+            for row, task in enumerate(new_tasks, start=first_row):
+                self._files_list.item(row).setData(Qt.ItemDataRole.UserRole, task)
+        finally:
+            self._files_list.setUpdatesEnabled(True)
+        self._tasks.extend(new_tasks)
 
         self._update_start_state()
         self._apply_defaults_if_needed()
         self._append_log(f"已添加 {len(new_tasks)} 个任务")
+        if self._worker is not None:
+            self._append_log("当前转换结束后再次开始即可转换新添加的任务，已完成的输出会自动跳过")
 
     def _on_excel_browse_input(self) -> None:
         path, _ = QFileDialog.getOpenFileName(
@@ -880,6 +1492,7 @@ class MainWindow(QWidget):
             "选择 Excel 文件",
             "",
             "Excel 文件 (*.xlsx *.xlsm *.xltx *.xltm);;所有文件 (*)",
+            options=_OPEN_DIALOG_OPTIONS,
         )
         if path:
             self._excel_input_edit.setText(path)
@@ -890,6 +1503,7 @@ class MainWindow(QWidget):
             "选择输出 Excel 文件",
             "",
             "Excel 文件 (*.xlsx);;所有文件 (*)",
+            options=_DIALOG_OPTIONS,
         )
         if path:
             self._excel_output_edit.setText(path)
@@ -900,10 +1514,20 @@ class MainWindow(QWidget):
             "选择 HTML 模板",
             "",
             "HTML 模板 (*.html *.htm *.txt);;所有文件 (*)",
+            options=_OPEN_DIALOG_OPTIONS,
         )
         if path:
             try:
                 with open(path, "r", encoding="utf-8") as file:
+                    size = os.fstat(file.fileno()).st_size
+                    if size > TEMPLATE_MAX_BYTES:
+                        QMessageBox.warning(
+                            self,
+                            "读取失败",
+                            f"模板文件过大（{size / 1024 / 1024:.1f} MiB），"
+                            f"上限为 {TEMPLATE_MAX_BYTES // 1024 // 1024} MiB",
+                        )
+                        return
                     content = file.read()
             except Exception as exc:  # noqa: BLE001
                 QMessageBox.warning(self, "读取失败", f"无法读取模板文件：{exc}")
@@ -937,7 +1561,7 @@ class MainWindow(QWidget):
             QMessageBox.warning(self, "参数错误", "请选择需要处理的 Excel 文件")
             return
 
-        self._excel_log_view.clear()
+        self._excel_log.clear()
         self._set_excel_controls_running(True)
 
         self._excel_worker = ExcelWorker(
@@ -953,8 +1577,7 @@ class MainWindow(QWidget):
         self._excel_worker.start()
 
     def _append_excel_log(self, message: str) -> None:
-        self._excel_log_view.append(message)
-        self._excel_log_view.moveCursor(QTextCursor.End)
+        self._excel_log.append(message)
 
     def _on_excel_error(self, message: str) -> None:
         self._append_excel_log(f"❌ {message}")
@@ -984,7 +1607,8 @@ class MainWindow(QWidget):
 
     def _on_excel_input_changed(self) -> None:
         self._update_excel_run_state()
-        self._update_excel_variables()
+        # 输入框逐字编辑时合并为一次读取
+        self._excel_variables_timer.start()
 
     def _update_excel_variables(self) -> None:
         path = self._excel_input_edit.text().strip()
@@ -993,51 +1617,72 @@ class MainWindow(QWidget):
             self._excel_variables_list.addItem("请先选择 Excel 输入文件")
             return
 
-        file_path = Path(path)
-        if not file_path.exists():
+        try:
+            stat_result = Path(path).stat()
+        except OSError:
             self._excel_variables_list.addItem("⚠️ 文件不存在")
             return
 
-        try:
-            workbook = load_workbook(str(file_path), read_only=True, data_only=True)
-        except Exception as exc:  # noqa: BLE001
-            self._excel_variables_list.addItem(f"⚠️ 读取失败: {exc}")
+        # 文件内容未变化时直接复用上次读取的变量
+        cache_key = (path, stat_result.st_mtime_ns, stat_result.st_size)
+        cached = self._excel_header_cache.get(cache_key)
+        if cached is not None:
+            self._excel_header_cache.move_to_end(cache_key)
+            self._show_excel_headers(*cached)
             return
 
-        try:
-            sheet = workbook.active
-            headers: list[str] = []
-            duplicates: set[str] = set()
-            for col in range(1, sheet.max_column + 1):
-                value = sheet.cell(row=1, column=col).value
-                if value is None:
-                    continue
-                header = str(value).strip()
-                if not header or header == RESULT_HEADER:
-                    continue
-                if header in headers:
-                    duplicates.add(header)
-                    continue
-                headers.append(header)
-        finally:
-            workbook.close()
+        # 大文件解析可能耗时数秒，放到后台线程；旧的读取结果到达时按路径丢弃
+        self._excel_variables_list.addItem("正在读取变量...")
+        worker = HeaderProbeWorker(path, cache_key)
+        worker.headers_signal.connect(self._on_excel_headers_loaded)
+        worker.error_signal.connect(self._on_excel_headers_failed)
+        worker.finished.connect(self._release_header_workers)
+        self._header_workers.add(worker)
+        worker.start()
+
+    def _release_header_workers(self) -> None:
+        # 在界面线程中释放已结束的线程对象，避免在其自身线程内被销毁
+        self._header_workers = {
+            worker for worker in self._header_workers if not worker.isFinished()
+        }
+
+    def _on_excel_headers_loaded(self, result: ExcelHeaders) -> None:
+        self._excel_header_cache[result.cache_key] = (result.headers, result.duplicates)
+        self._excel_header_cache.move_to_end(result.cache_key)
+        while len(self._excel_header_cache) > EXCEL_HEADER_CACHE_SIZE:
+            self._excel_header_cache.popitem(last=False)
+
+        if result.path != self._excel_input_edit.text().strip():
+            return
+        self._show_excel_headers(result.headers, result.duplicates)
 
+    def _show_excel_headers(self, headers: list[str], duplicates: list[str]) -> None:
+        self._excel_variables_list.clear()
         if not headers:
             self._excel_variables_list.addItem("⚠️ 首行未检测到模板变量")
             return
 
-        for header in headers:
-            item = QListWidgetItem(header)
-            item.setData(Qt.ItemDataRole.UserRole, header)
-            self._excel_variables_list.addItem(item)
+        self._excel_variables_list.setUpdatesEnabled(False)
+        try:
+            self._excel_variables_list.addItems(headers)
+            for row, header in enumerate(headers):
+                self._excel_variables_list.item(row).setData(Qt.ItemDataRole.UserRole, header)
+        finally:
+            self._excel_variables_list.setUpdatesEnabled(True)
 
         if duplicates:
-            note = f"⚠️ 重复变量已忽略: {', '.join(sorted(duplicates))}"
+            note = f"⚠️ 重复变量已忽略: {', '.join(duplicates)}"
             warning_item = QListWidgetItem(note)
             warning_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
             warning_item.setData(Qt.ItemDataRole.UserRole, None)
             self._excel_variables_list.addItem(warning_item)
 
+    def _on_excel_headers_failed(self, path: str, message: str) -> None:
+        if path != self._excel_input_edit.text().strip():
+            return
+        self._excel_variables_list.clear()
+        self._excel_variables_list.addItem(f"⚠️ 读取失败: {message}")
+
     def _on_excel_variable_double_clicked(self, item: QListWidgetItem) -> None:
         header = item.data(Qt.ItemDataRole.UserRole)
         if not header:
@@ -1053,53 +1698,6 @@ class MainWindow(QWidget):
         has_input = bool(self._excel_input_edit.text().strip())
         self._excel_run_btn.setEnabled(has_input)
 
-    def _detect_sequence(self, frame_path: Path) -> SequenceInfo | None:
-        match = re.match(r"(.*?)(\d+)(\.[^.]+)$", frame_path.name)
-        if not match:
-            return None
-
-        prefix, number_str, extension = match.groups()
-        padding = len(number_str)
-        directory = frame_path.parent
-        regex = re.compile(rf"^{re.escape(prefix)}(\d+){re.escape(extension)}$")
-
-        frames: List[tuple[int, Path]] = []
-        for candidate in directory.iterdir():
-            if not candidate.is_file():
-                continue
-            candidate_match = regex.match(candidate.name)
-            if not candidate_match:
-                continue
-            try:
-                frame_number = int(candidate_match.group(1))
-            except ValueError:
-                continue
-            frames.append((frame_number, candidate.resolve()))
-
-        if len(frames) < 2:
-            return None
-
-        frames.sort(key=lambda item: item[0])
-        start_number, first_frame = frames[0]
-        frame_count = len(frames)
-        pattern = str(directory / f"{prefix}%0{padding}d{extension}")
-        prefix_name = (
-            prefix.rstrip("_- ")
-            or prefix
-            or first_frame.parent.name
-            or first_frame.stem
-        )
-
-        return SequenceInfo(
-            pattern=pattern,
-            first_frame=first_frame,
-            extension=extension,
-            start_number=start_number,
-            frame_count=frame_count,
-            prefix=prefix_name,
-            padding=padding,
-        )
-
     def _build_sequence_task(self, sequence: SequenceInfo) -> ConversionTask | None:
         output_stem = (
             sequence.prefix.strip()
@@ -1134,14 +1732,25 @@ class MainWindow(QWidget):
     def _apply_defaults_if_needed(self) -> None:
         if self._defaults_applied or not self._tasks:
             return
+        # 用户已手动填写参数时不再探测，也不覆盖其输入
+        if any(
+            edit.text().strip()
+            for edit in (self._width_edit, self._height_edit, self._fps_edit)
+        ):
+            self._defaults_applied = True
+            return
 
         first_task = self._tasks[0]
         try:
-            if first_task.is_sequence and first_task.first_frame:
-                width, height = probe_image_metadata(first_task.first_frame)
+            if first_task.width and first_task.height:
+                # 视频与动图在添加时已探测过，直接复用
+                width, height = first_task.width, first_task.height
+                fps = first_task.fps or self._current_fps()
+            elif first_task.is_sequence and first_task.first_frame:
+                width, height, _, _ = probe_image_metadata(first_task.first_frame)
                 fps = self._current_fps()
             elif first_task.source.suffix.lower() in IMAGE_EXTENSIONS:
-                width, height = probe_image_metadata(first_task.source)
+                width, height, _, _ = probe_image_metadata(first_task.source)
                 fps = self._current_fps()
             else:
                 width, height, fps, frames, duration = probe_video_metadata(
@@ -1161,31 +1770,10 @@ class MainWindow(QWidget):
     def showEvent(self, event):  # type: ignore[override]
         super().showEvent(event)
         if not self._output_edit.text():
-            default_output = self._default_output_directory()
+            default_output = _default_output_directory()
             self._output_edit.setText(str(default_output))
             self._update_start_state()
 
-    def _default_output_directory(self) -> Path:
-        home = Path.home()
-        downloads = home / "Downloads"
-        if downloads.exists():
-            return downloads
-        if sys.platform.startswith("win"):
-            from ctypes import windll, wintypes, create_unicode_buffer
-
-            CSIDL_PERSONAL = 0x0005
-            SHGFP_TYPE_CURRENT = 0
-            buf = create_unicode_buffer(wintypes.MAX_PATH)
-            result = windll.shell32.SHGetFolderPathW(
-                None, CSIDL_PERSONAL, None, SHGFP_TYPE_CURRENT, buf
-            )
-            if result == 0:
-                documents = Path(buf.value)
-                candidate = documents.parent / "Downloads"
-                if candidate.exists():
-                    return candidate
-        return home
-
     # 拖拽处理
     def dragEnterEvent(self, event: QDragEnterEvent) -> None:  # type: ignore[override]
         if self._contains_valid_urls(event.mimeData()):
@@ -1195,17 +1783,24 @@ class MainWindow(QWidget):
 
     def dropEvent(self, event: QDropEvent) -> None:  # type: ignore[override]
         urls = event.mimeData().urls()
-        paths = []
+        files: list[Path] = []
+        folders: list[Path] = []
         for url in urls:
-            local_path = Path(url.toLocalFile())
-            if local_path.is_dir():
-                paths.extend(p for p in local_path.rglob("*") if p.is_file())
-            else:
-                paths.append(local_path)
-
-        filtered = [p for p in paths if p.suffix.lower() in SUPPORTED_EXTENSIONS]
-        if filtered:
-            self._add_paths(filtered)
+            if not url.isLocalFile():
+                continue
+            local_file = url.toLocalFile()
+            if os.path.isdir(local_file):
+                folders.append(Path(local_file))
+            elif os.path.splitext(local_file)[1].lower() in SUPPORTED_EXTENSIONS:
+                files.append(Path(local_file))
+
+        if files or folders:
+            # 文件夹交给后台探测线程遍历，拖入大目录时界面不再卡顿
+            self._add_paths(
+                itertools.chain(
+                    files, *(_walk_media(folder, SUPPORTED_EXTENSIONS) for folder in folders)
+                )
+            )
             event.acceptProposedAction()
         else:
             self._append_log("拖拽内容未包含可支持的媒体文件")
@@ -1215,10 +1810,14 @@ class MainWindow(QWidget):
         if not mime_data.hasUrls():
             return False
         for url in mime_data.urls():
-            path = Path(url.toLocalFile())
-            if path.is_dir():
+            # 非本地 URL 的 toLocalFile() 为空串，Path("") 会被当作当前目录
+            if not url.isLocalFile():
+                continue
+            local_file = url.toLocalFile()
+            # 先比较扩展名，只有不匹配时才需要 stat 判断是否为目录
+            if os.path.splitext(local_file)[1].lower() in SUPPORTED_EXTENSIONS:
                 return True
-            if path.suffix.lower() in SUPPORTED_EXTENSIONS:
+            if os.path.isdir(local_file):
                 return True
         return False
 
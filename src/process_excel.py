@@ -10,11 +10,14 @@ import argparse
 import os
 import sys
 import re
+import time
+from typing import Callable
 
-import openpyxl
 
 DEFAULT_TEMPLATE = """<p>{desc}</p><p>{name}</p><p>{price}</p><p>【具体价格请咨询商家】</p><p><br></p><p>不只是卖花，更是传递思念与欢喜，让每一份情感都有处安放。</p><p><br></p><p><img alt="图片上传" src="https://jmy-pic.baidu.com/0/pic/-1385074748_501952671_1241745945.jpg" class="fr-fic fr-dii"></p><p><img alt="图片上传" src="https://jmy-pic.baidu.com/0/pic/1850010481_-13527842_504047256.jpg" class="fr-fic fr-dii"></p><p><img alt="图片上传" src="https://jmy-pic.baidu.com/0/pic/-484983576_678918380_-191833468.jpg" class="fr-fic fr-dii"></p>"""
 RESULT_HEADER = "生成结果"
+# 逐行输出日志的开销远大于渲染本身，默认只按时间间隔汇报进度
+PROGRESS_INTERVAL = 0.2
 
 
 def _load_template_from_file(template_path: str) -> str:
@@ -39,15 +42,21 @@ def _resolve_template(template_text: str | None, template_path: str | None) -> s
     return DEFAULT_TEMPLATE
 
 
-def _build_header_mapping(sheet) -> dict[str, int]:
+def _build_header_mapping(sheet) -> tuple[dict[str, int], int | None]:
+    """Map template variables to their columns and locate an existing result column."""
+
     mapping: dict[str, int] = {}
-    max_col = sheet.max_column
-    for col in range(1, max_col + 1):
-        header_value = sheet.cell(row=1, column=col).value
+    result_column: int | None = None
+    header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    for col, header_value in enumerate(header_row, start=1):
         if header_value is None:
             continue
         header_str = str(header_value).strip()
-        if not header_str or header_str == RESULT_HEADER:
+        if header_str == RESULT_HEADER:
+            if result_column is None:
+                result_column = col
+            continue
+        if not header_str:
             continue
         if header_str in mapping:
             print(f"警告：变量 '{header_str}' 重复，仅保留第一列。")
@@ -56,21 +65,31 @@ def _build_header_mapping(sheet) -> dict[str, int]:
     if not mapping:
         print("错误：首行未定义任何模板变量。")
         sys.exit(1)
-    return mapping
+    return mapping, result_column
 
 
 _PLACEHOLDER_PATTERN = re.compile(r"{([^{}]+)}")
 
 
-def _render_template(template: str, values: dict[str, str]) -> str:
-    def replacer(match: re.Match) -> str:
-        key = match.group(1)
-        return values.get(key, "")
+def _compile_template(template: str) -> Callable[[dict[str, str]], str]:
+    """Parse ``template`` once and return a function rendering it for one row."""
+
+    # split 的结果在字面文本与变量名之间交替，逐行渲染时只需替换变量所在位置再拼接
+    pieces = _PLACEHOLDER_PATTERN.split(template)
+    slots = [(index, pieces[index]) for index in range(1, len(pieces), 2)]
 
-    return _PLACEHOLDER_PATTERN.sub(replacer, template)
+    def render(values: dict[str, str]) -> str:
+        parts = pieces.copy()
+        for index, key in slots:
+            parts[index] = values.get(key, "")
+        return "".join(parts)
 
+    return render
 
-def process_excel(input_file, output_file=None, template_file=None, template_text=None):
+
+def process_excel(
+    input_file, output_file=None, template_file=None, template_text=None, verbose=False
+):
     """
     处理 Excel 文件，替换模板中的占位符
 
@@ -79,6 +98,7 @@ def process_excel(input_file, output_file=None, template_file=None, template_tex
         output_file: 输出文件路径（可选，默认覆盖原文件）
         template_file: HTML 模板文件路径（可选）
         template_text: HTML 模板文本内容（可选，高优先级）
+        verbose: 是否逐行输出处理详情（可选，默认仅定期汇报进度）
     """
     # 检查输入文件是否存在
     if not os.path.exists(input_file):
@@ -91,25 +111,45 @@ def process_excel(input_file, output_file=None, template_file=None, template_tex
 
     print(f"正在读取文件: {input_file}")
 
+    # 延迟导入：GUI 启动时会导入本模块，openpyxl 只在真正处理 Excel 时才需要
+    import openpyxl
+
     try:
         # 读取 Excel 文件
         workbook = openpyxl.load_workbook(input_file)
         sheet = workbook.active
 
         template_content = _resolve_template(template_text, template_file)
-        header_mapping = _build_header_mapping(sheet)
+        header_mapping, result_column = _build_header_mapping(sheet)
+        # 模板只解析一次，逐行渲染时不再重复扫描模板文本
+        render = _compile_template(template_content)
 
-        result_column = sheet.max_column + 1
-        sheet.cell(row=1, column=result_column, value=RESULT_HEADER)
+        # 已处理过的文件沿用原有结果列，重复运行时不会再追加一列
+        reuse_result_column = result_column is not None
+        if result_column is None:
+            result_column = sheet.max_column + 1
+            sheet.cell(row=1, column=result_column, value=RESULT_HEADER)
 
         processed_count = 0
-
-        # 遍历数据行（从第2行开始）
-        for row in range(2, sheet.max_row + 1):
+        total_rows = max(0, sheet.max_row - 1)
+        last_report = time.monotonic()
+
+        # 遍历数据行（从第2行开始），按行批量取值，只覆盖变量所在的列范围
+        first_col = min(header_mapping.values())
+        last_col = max(header_mapping.values())
+        offsets = [(key, col - first_col) for key, col in header_mapping.items()]
+        data_rows = sheet.iter_rows(
+            min_row=2,
+            max_row=sheet.max_row,
+            min_col=first_col,
+            max_col=last_col,
+            values_only=True,
+        )
+        for row, row_values in enumerate(data_rows, start=2):
             values: dict[str, str] = {}
             non_empty = False
-            for key, col in header_mapping.items():
-                cell_value = sheet.cell(row=row, column=col).value
+            for key, offset in offsets:
+                cell_value = row_values[offset]
                 if cell_value is None:
                     values[key] = ""
                 else:
@@ -117,15 +157,25 @@ def process_excel(input_file, output_file=None, template_file=None, template_tex
                     values[key] = str(cell_value)
 
             if not non_empty:
+                if reuse_result_column:
+                    # 该行已无数据，清除上次运行留下的结果
+                    sheet.cell(row=row, column=result_column).value = None
                 continue
 
-            result = _render_template(template_content, values)
+            result = render(values)
 
             sheet.cell(row=row, column=result_column, value=result)
-            print(f"处理第 {row} 行: {values}")
             processed_count += 1
+            if verbose:
+                print(f"处理第 {row} 行: {values}")
+            else:
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    print(f"已处理 {row - 1}/{total_rows} 行")
+                    last_report = now
 
         # 保存文件
+        print(f"正在保存文件: {output_file}")
         workbook.save(output_file)
         print(f"\n✅ 处理完成！")
         print(f"   - 共处理 {processed_count} 行数据")
@@ -169,11 +219,19 @@ def main():
         help="直接传入 HTML 模板内容（优先于 --template）",
         default=None,
     )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        help="逐行输出处理详情（默认仅定期汇报进度）",
+        action="store_true",
+    )
 
     args = parser.parse_args()
 
     # 处理文件
-    process_excel(args.input, args.output, args.template, args.template_text)
+    process_excel(
+        args.input, args.output, args.template, args.template_text, verbose=args.verbose
+    )
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import time
 from typing import Callable, Optional, Type, TypeVar
 
@@ -11,6 +12,9 @@ ProgressFactory = TypeVar("ProgressFactory")
 class StageProgressTracker:
     """Handle ffmpeg 进度输出的阶段性计算与节流"""
 
+    # 两次回调之间的最小间隔；间隔内的更新只保留最新一条，间隔结束后补发
+    EMIT_INTERVAL = 0.05
+
     def __init__(
         self,
         *,
@@ -31,6 +35,8 @@ class StageProgressTracker:
         self.last_real_ratio = 0.0
         self.last_real_time = now
         self.stage_start = now
+        # 被节流推迟的 (比例, 是否估算)，等待间隔结束后补发
+        self._pending: Optional[tuple[float, bool]] = None
 
     def emit_initial(self) -> None:
         if self._emit_callback:
@@ -63,11 +69,7 @@ class StageProgressTracker:
 
         if target > self.stage_ratio:
             self.stage_ratio = target
-            self._emit(
-                self.stage_ratio,
-                f"{self.stage_label} 估算 {self.stage_ratio * 100:.1f}%",
-                force=True,
-            )
+            self._emit(self.stage_ratio, force=True, estimated=True)
 
     def try_update_from_ffmpeg(
         self,
@@ -78,7 +80,8 @@ class StageProgressTracker:
         duration_ms: Optional[int],
     ) -> bool:
         ratio_update: Optional[float] = None
-        text = value_text.strip()
+        # 调用方传入的值已去掉换行，int/float 本身也能容忍首尾空白，无需再 strip
+        text = value_text
 
         if frame_estimate and frame_estimate > 0 and key == "frame":
             try:
@@ -110,38 +113,79 @@ class StageProgressTracker:
 
         ratio_update = max(ratio_update, self.last_real_ratio)
         ratio_update = min(1.0, ratio_update)
+        now = time.monotonic()
         self.stage_ratio = ratio_update
         self.last_real_ratio = ratio_update
-        self.last_real_time = time.monotonic()
-        self._emit(
-            self.stage_ratio,
-            f"{self.stage_label} {self.stage_ratio * 100:.1f}% (全局 {(self.base + self.stage_ratio * self.extent) * 100:.1f}%)",
-        )
+        self.last_real_time = now
+        self._emit(self.stage_ratio, now=now)
         return True
 
+    def flush_pending(self, now: Optional[float] = None) -> None:
+        """Deliver an update held back by the throttle once the interval has passed."""
+
+        if self._pending is None:
+            return
+        if now is None:
+            now = time.monotonic()
+        if now - self.last_emit_time >= self.EMIT_INTERVAL:
+            ratio, estimated = self._pending
+            self._deliver(ratio, estimated, now)
+
     def finish(self) -> None:
-        self._emit(
-            1.0,
-            f"{self.stage_label} 100.0% (全局 {(self.base + self.extent) * 100:.1f}%)",
-            force=True,
-        )
+        # 收到 progress=end 时 100% 已经推送过，不再重复
+        if self.last_emit_ratio < 1.0:
+            self._emit(1.0, force=True)
+        self._pending = None
 
-    def _emit(self, ratio: float, description: str, *, force: bool = False) -> None:
+    def _emit(
+        self,
+        ratio: float,
+        *,
+        force: bool = False,
+        estimated: bool = False,
+        now: Optional[float] = None,
+    ) -> None:
         if not self._emit_callback:
             return
 
         ratio = max(0.0, min(1.0, ratio))
-        now = time.monotonic()
-        if (
-            force
-            or ratio - self.last_emit_ratio >= 0.001
-            or now - self.last_emit_time >= 0.2
-            or ratio >= 1.0
-        ):
-            global_ratio = self.base + ratio * self.extent
-            self._emit_callback(global_ratio, description)
-            self.last_emit_ratio = ratio
-            self.last_emit_time = now
+        if ratio <= self.last_emit_ratio and not force:
+            return
+        if now is None:
+            now = time.monotonic()
+        # 距上次推送不足间隔时只记录最新值，避免界面线程被频繁唤醒；
+        # 描述文本只在确定推送时才生成
+        if force or ratio >= 1.0 or now - self.last_emit_time >= self.EMIT_INTERVAL:
+            self._deliver(ratio, estimated, now)
+        else:
+            self._pending = (ratio, estimated)
+
+    def _deliver(self, ratio: float, estimated: bool, now: float) -> None:
+        global_ratio = self.base + ratio * self.extent
+        if estimated:
+            description = f"{self.stage_label} 估算 {ratio * 100:.1f}%"
+        else:
+            description = (
+                f"{self.stage_label} {ratio * 100:.1f}% (全局 {global_ratio * 100:.1f}%)"
+            )
+        self._emit_callback(global_ratio, description)
+        self.last_emit_ratio = ratio
+        self.last_emit_time = now
+        self._pending = None
+
+
+class ProgressAggregator:
+    """汇总并行任务的进度，整体进度为各任务完成比例之和除以任务总数"""
+
+    def __init__(self, total_tasks: int) -> None:
+        self._total_tasks = max(1, total_tasks)
+        self._fractions: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def update(self, task_index: int, fraction: float, task_count: int = 1) -> float:
+        with self._lock:
+            self._fractions[task_index] = fraction * task_count
+            return min(1.0, sum(self._fractions.values()) / self._total_tasks)
 
 
 class TaskProgressEmitter:
@@ -157,6 +201,8 @@ class TaskProgressEmitter:
         progress_factory: Callable[..., ProgressFactory],
         signals: Optional[object],
         cancel_exception: Type[BaseException],
+        task_count: int = 1,
+        aggregator: Optional[ProgressAggregator] = None,
     ) -> None:
         self._task_index = task_index
         self._total_tasks = total_tasks
@@ -165,23 +211,28 @@ class TaskProgressEmitter:
         self._progress_factory = progress_factory
         self._signals = signals
         self._cancel_exception = cancel_exception
+        # 多个任务合并执行时，进度按占用的任务数折算到整体
+        self._task_count = task_count
+        self._aggregator = aggregator
 
     def emit(self, progress_value: float, stage: str) -> None:
         clamped = max(0.0, min(1.0, progress_value))
         signals = self._signals
 
-        if signals is not None:
-            while (
-                not signals.pause_event.is_set() and not signals.cancel_event.is_set()
-            ):
-                time.sleep(0.05)
-            if signals.cancel_event.is_set():
-                raise self._cancel_exception
+        # 暂停期间阻塞等待而不是轮询，恢复或取消时立即唤醒
+        if signals is not None and signals.wait_if_paused():
+            raise self._cancel_exception
 
         if not self._progress_callback:
             return
 
-        overall = min(1.0, ((self._task_index - 1) + clamped) / self._total_tasks)
+        if self._aggregator is not None:
+            overall = self._aggregator.update(self._task_index, clamped, self._task_count)
+        else:
+            overall = min(
+                1.0,
+                ((self._task_index - 1) + clamped * self._task_count) / self._total_tasks,
+            )
         progress = self._progress_factory(
             task_index=self._task_index,
             total_tasks=self._total_tasks,